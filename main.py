@@ -28,4 +28,5 @@ if __name__ == "__main__":
     
     host = os.getenv("SERVER_HOST", "0.0.0.0")
     port = int(os.getenv("SERVER_PORT", 8000))
+    # Same loop and worker settings as src/server.py; see the note there
     uvicorn.run(app, host=host, port=port)
@@ -1,15 +1,92 @@
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any, TYPE_CHECKING
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Deque, Set, Tuple, TYPE_CHECKING
+from dataclasses import dataclass, field
 
 if TYPE_CHECKING:
+    import asyncio
+    from mcp.server.session import ServerSession
     from .tws_client import TWSClient
 
 
+@dataclass(slots=True)
+class MarketDataEntry:
+    """Market data stream for one resource: its task and latest cached tick."""
+    uri: str  # Resource URI, built once at subscription
+    params: Dict[str, Any]  # Contract parameters the stream was started with
+    # Resource JSON is envelope_prefix + volatile_json + envelope_suffix; only the
+    # middle part (data and last_update) changes. It is cleared when a new tick is
+    # published and serialized again on the next read.
+    envelope_prefix: str
+    envelope_suffix: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = 0  # last_update, in event loop time
+    volatile_json: Optional[str] = None
+    # Sessions that started the stream; one TWS subscription notifies all of them
+    subscribers: Set['ServerSession'] = field(default_factory=set)
+    task: Optional['asyncio.Task'] = None
+    # Client of the session that started the stream; the stream ends with that session
+    tws: Optional['TWSClient'] = None
+
+
+@dataclass(slots=True)
+class PortfolioEntry:
+    """Portfolio stream for one account: its task and latest cached update."""
+    data: Dict[str, Any]
+    timestamp: float  # last_update, in event loop time
+    serialized: str = ""  # Resource JSON, rebuilt on each update
+    task: Optional['asyncio.Task'] = None
+
+
+@dataclass(slots=True)
+class TickNewsItem:
+    """Cached tick news headline; orjson serializes it as an object in field order."""
+    symbol: str
+    time: Optional[str]
+    providerCode: Optional[str]
+    articleId: Optional[str]
+    headline: Optional[str]
+    extraData: Optional[str]
+    timestamp: int  # Arrival time in seconds, used for expiry
+
+
+@dataclass(slots=True)
+class BroadTapeNewsItem:
+    """Cached BroadTape headline; orjson serializes it as an object in field order."""
+    timestamp: int  # Arrival time in seconds, used for expiry
+    providerCode: Optional[str]
+    articleId: Optional[str]
+    headline: Optional[str]
+    source: Optional[str]  # Provider whose feed carried the headline
+    time: Optional[str]
+
+
+@dataclass(slots=True)
+class TickNewsManager:
+    """Tick news streams of one session: per-symbol caches and tasks, and the shared dispatcher."""
+    cache: Dict[str, Deque[TickNewsItem]] = field(default_factory=dict)  # symbol -> bounded deque of news items
+    # symbol -> recently seen (providerCode, articleId) keys, oldest first, for dropping re-sent headlines
+    seen_articles: Dict[str, Dict[Tuple[str, str], None]] = field(default_factory=dict)
+    subscriptions: Set[str] = field(default_factory=set)  # Subscribed symbols
+    subscriptions_view: Tuple[str, ...] = ()  # Snapshot of subscriptions for responses, refreshed on start/stop
+    tasks: Dict[str, 'asyncio.Task'] = field(default_factory=dict)  # symbol -> background task
+    uris: Dict[str, str] = field(default_factory=dict)  # symbol -> resource URI, built once at subscription
+    all_stream: bool = False  # Whether '*' aggregation is enabled
+    session: Optional['ServerSession'] = None  # Session notified of new headlines
+    json: Dict[str, str] = field(default_factory=dict)  # symbol or '*' -> serialized resource, cleared on change
+    # Raw (symbol, news tick) pairs waiting for the dispatcher, and the flag that wakes it
+    pending: Optional[Deque[Tuple[str, Any]]] = None
+    wakeup: Optional['asyncio.Event'] = None
+    dispatch_task: Optional['asyncio.Task'] = None  # Single consumer of pending
+
+
 @dataclass
 class AppContext:
     """Application context for MCP server."""
     tws: 'TWSClient'
+    # Portfolio resource streams of this session, by account
+    portfolio_streams: Dict[str, PortfolioEntry] = field(default_factory=dict)
+    # Tick news resource streams of this session
+    tick_news: TickNewsManager = field(default_factory=TickNewsManager)
 
 class ContractRequest(BaseModel):
     symbol: str
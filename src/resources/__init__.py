@@ -3,9 +3,11 @@
 from .market_data import register_market_data_resource
 from .portfolio import register_portfolio_resource
 from .news import register_news_resource
+from .streams import register_streams_resource
 
 __all__ = [
     "register_market_data_resource",
     "register_portfolio_resource",
-    "register_news_resource"
+    "register_news_resource",
+    "register_streams_resource"
 ]
@@ -0,0 +1,38 @@
+"""Helpers for the background tasks behind streaming resources."""
+
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Longest time (seconds) a stop tool waits for a cancelled stream task to finish
+_STREAM_STOP_TIMEOUT = 2.0
+
+
+def task_status(task: Optional[asyncio.Task]) -> str:
+    """Describe the state of a background streaming task."""
+    if task is None:
+        return "not_started"
+    if not task.done():
+        return "running"
+    if task.cancelled():
+        return "cancelled"
+    return "failed" if task.exception() is not None else "completed"
+
+
+async def stop_stream_task(task: asyncio.Task) -> None:
+    """Cancel a streaming task and wait for it to finish, for at most _STREAM_STOP_TIMEOUT.
+    
+    The wait is shielded, so cancelling the caller never interrupts the task's own
+    cleanup; the caller's cancellation is re-raised so its finally blocks still run.
+    A task that does not stop in time is left to finish in the background.
+    """
+    task.cancel()
+    try:
+        await asyncio.wait_for(asyncio.shield(task), _STREAM_STOP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("[RESOURCE] Stream task did not stop within %ss", _STREAM_STOP_TIMEOUT)
+    except asyncio.CancelledError:
+        if asyncio.current_task().cancelling():
+            raise
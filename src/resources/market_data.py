@@ -1,17 +1,168 @@
 """Market data streaming resource."""
 
 import asyncio
-import json
-from typing import Dict, Any, Set, Optional
+import logging
+from typing import Dict, Any, List, Optional
+import orjson
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.session import ServerSession
-from ..models import AppContext, ContractRequest
+from ..models import AppContext, ContractRequest, MarketDataEntry
+from ._tasks import stop_stream_task, task_status
 
+logger = logging.getLogger(__name__)
 
-# Global state for market data resources
-_market_data_cache: Dict[str, Dict[str, Any]] = {}
-_market_data_resource_subscriptions: Set[str] = set()
-_resource_background_streams: Dict[str, asyncio.Task] = {}
+# Global state for market data resources: one entry per streaming resource
+_market_streams: Dict[str, MarketDataEntry] = {}
+
+# Minimum interval (seconds) between notifications for one resource; ticks in between only update the cache
+_MARKET_DATA_NOTIFY_INTERVAL = 0.05
+
+
+def _serialize_volatile(data: Dict[str, Any], timestamp: float) -> str:
+    """Serialize the per-tick part of the market data resource: data and last_update."""
+    return orjson.dumps(data).decode() + ',"last_update":' + orjson.dumps(timestamp).decode()
+
+
+def list_market_data_streams() -> List[Dict[str, Any]]:
+    """Describe the active market data streams."""
+    return [
+        {
+            "resource_id": resource_id,
+            "resource_uri": entry.uri,
+            "contract": entry.params,
+            "last_update": entry.timestamp,
+            "subscribers": len(entry.subscribers),
+            "status": task_status(entry.task)
+        }
+        for resource_id, entry in list(_market_streams.items())
+    ]
+
+
+def cancel_market_data_streams(tws: Any) -> None:
+    """Cancel the market data streams running on a session's TWS client.
+    
+    Called when that session ends. The entries are removed here rather than left to
+    the tasks, which never run their cleanup if cancelled before they start, so other
+    sessions sharing a stream can start it again on their own client.
+    """
+    for resource_id, entry in list(_market_streams.items()):
+        if entry.tws is tws:
+            del _market_streams[resource_id]
+            if entry.task:
+                entry.task.cancel()
+
+
+def _start_market_data_stream(session: ServerSession, tws: Any, req: ContractRequest) -> Dict[str, Any]:
+    """Start the background stream for one contract and describe the subscription.
+    
+    Streaming starts in a background task, so this returns without waiting on TWS.
+    A running stream is shared with the session; it stays on the TWS client of the
+    session that started it and ends with that session. A stream whose task has
+    ended (TWS error, or its session closed) is replaced by a new one.
+    """
+    symbol, secType, exchange, currency = req.symbol, req.secType, req.exchange, req.currency
+    
+    # Create resource ID: for CASH (forex), use symbol.currency format
+    # For stocks and others, just use symbol
+    if secType == "CASH":
+        resource_id = f"{symbol}.{currency}"
+    else:
+        resource_id = symbol
+    
+    existing = _market_streams.get(resource_id)
+    if existing is not None and not existing.task.done():
+        # Share the running TWS subscription with this session
+        existing.subscribers.add(session)
+        return {
+            "status": "already_subscribed",
+            "resource_uri": existing.uri,
+            "message": f"Market data already streaming for {resource_id}"
+        }
+    
+    # Initialize cache
+    params = {
+        "symbol": symbol,
+        "secType": secType,
+        "exchange": exchange,
+        "currency": currency
+    }
+    entry = MarketDataEntry(
+        uri=f"ibkr://market-data/{resource_id}",
+        params=params,
+        envelope_prefix='{"resource_id":' + orjson.dumps(resource_id).decode() + ',"subscribed":true,"data":',
+        envelope_suffix=',"contract":' + orjson.dumps(params).decode() + '}',
+        subscribers={session},
+        tws=tws
+    )
+    
+    # Start background streaming task
+    async def stream_to_resource():
+        """Background task that updates the resource and sends notifications."""
+        logger.info("[RESOURCE] Starting market data stream for %s (%s/%s)", resource_id, symbol, currency)
+        now = asyncio.get_running_loop().time
+        resource_uri = entry.uri
+        subscribers = entry.subscribers
+    
+        # Latest tick and its arrival time, not yet published. Ticks superseded before the
+        # notifier runs are dropped, so a slow client never makes ticks queue up.
+        pending: Optional[tuple] = None
+        notify_event = asyncio.Event()
+    
+        async def notify_clients():
+            """Publish the latest tick to the cache and notify subscribers, at most once per interval."""
+            while True:
+                await notify_event.wait()
+                notify_event.clear()
+                data, entry.timestamp = pending
+                entry.data = data
+                entry.volatile_json = None
+                sessions = list(subscribers)
+                results = await asyncio.gather(
+                    *(s.send_resource_updated(resource_uri) for s in sessions),
+                    return_exceptions=True
+                )
+                for s, result in zip(sessions, results):
+                    if isinstance(result, Exception):
+                        # The session is gone; stop notifying it
+                        logger.warning("[RESOURCE] Failed to notify %s: %s", resource_id, result)
+                        subscribers.discard(s)
+                await asyncio.sleep(_MARKET_DATA_NOTIFY_INTERVAL)
+    
+        notifier = asyncio.create_task(notify_clients())
+    
+        try:
+            async for data in tws.stream_market_data(req):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[RESOURCE] Received data for %s: %s", resource_id, data)
+                # Hand the tick to the notifier; never blocks on clients
+                pending = (data, now())
+                notify_event.set()
+    
+        except asyncio.CancelledError:
+            logger.info("[RESOURCE] Stream cancelled for %s", resource_id)
+        except Exception as e:
+            logger.exception("[RESOURCE] Stream error for %s: %s", resource_id, e)
+        finally:
+            notifier.cancel()
+            # A dead stream must not be shared with later subscribers
+            if _market_streams.get(resource_id) is entry:
+                del _market_streams[resource_id]
+    
+    entry.task = asyncio.create_task(stream_to_resource())
+    _market_streams[resource_id] = entry
+    
+    return {
+        "status": "subscribed",
+        "resource_uri": entry.uri,
+        "resource_id": resource_id,
+        "message": f"Market data streaming started. Subscribe to resource '{entry.uri}' to receive updates.",
+        "contract": {
+            "symbol": symbol,
+            "secType": secType,
+            "exchange": exchange,
+            "currency": currency
+        }
+    }
 
 
 def register_market_data_resource(mcp: FastMCP):
@@ -42,24 +193,20 @@ def register_market_data_resource(mcp: FastMCP):
         Returns:
             JSON string with current market data or error message
         """
-        print(f"[RESOURCE READ] Requested resource_id: '{resource_id}'")
-        print(f"[RESOURCE READ] Cache keys: {list(_market_data_cache.keys())}")
-        
-        if resource_id not in _market_data_cache:
-            return json.dumps({
+        entry = _market_streams.get(resource_id)
+        if entry is None:
+            return orjson.dumps({
                 "error": f"No data for {resource_id}",
                 "message": f"Call ibkr_start_market_data_resource() first to start streaming this resource",
                 "subscribed": False
-            })
+            }).decode()
         
-        data = _market_data_cache[resource_id]
-        return json.dumps({
-            "resource_id": resource_id,
-            "subscribed": True,
-            "data": data.get("data", {}),
-            "last_update": data.get("timestamp", 0),
-            "contract": data.get("params", {})
-        })
+        # Serialize the latest tick once, on the first read after it was published
+        if entry.volatile_json is None:
+            entry.volatile_json = _serialize_volatile(entry.data, entry.timestamp)
+        
+        # Splice the per-tick fields into the envelope serialized at subscription time
+        return entry.envelope_prefix + entry.volatile_json + entry.envelope_suffix
     
     @mcp.tool()
     async def ibkr_start_market_data_resource(
@@ -108,86 +255,54 @@ def register_market_data_resource(mcp: FastMCP):
         tws = ctx.request_context.lifespan_context.tws
         
         if not tws or not tws.is_connected():
-            return json.dumps({
+            return orjson.dumps({
                 "error": "TWS client not connected",
                 "message": "Call ibkr_connect first"
-            })
-        
-        # Create resource ID: for CASH (forex), use symbol.currency format
-        # For stocks and others, just use symbol
-        if secType == "CASH":
-            resource_id = f"{symbol}.{currency}"
-        else:
-            resource_id = symbol
-        
-        if resource_id in _market_data_resource_subscriptions:
-            return json.dumps({
-                "status": "already_subscribed",
-                "resource_uri": f"ibkr://market-data/{resource_id}",
-                "message": f"Market data already streaming for {resource_id}"
-            })
-        
-        # Initialize cache
-        _market_data_cache[resource_id] = {
-            "data": {},
-            "timestamp": 0,
-            "params": {
-                "symbol": symbol,
-                "secType": secType,
-                "exchange": exchange,
-                "currency": currency
-            }
-        }
+            }).decode()
         
-        # Start background streaming task
-        async def stream_to_resource():
-            """Background task that updates the resource and sends notifications."""
-            req = ContractRequest(symbol=symbol, secType=secType, exchange=exchange, currency=currency)
-            print(f"[RESOURCE] Starting market data stream for {resource_id} ({symbol}/{currency})")
-            print(f"[RESOURCE] TWS connected: {tws.is_connected()}")
+        return orjson.dumps(
+            _start_market_data_stream(
+                ctx.session, tws,
+                ContractRequest(symbol=symbol, secType=secType, exchange=exchange, currency=currency)
+            )
+        ).decode()
+    
+    @mcp.tool()
+    async def ibkr_start_market_data_resources(
+        ctx: Context[ServerSession, AppContext],
+        contracts: List[ContractRequest]
+    ) -> str:
+        """Start streaming market data to resources for several contracts at once.
+        
+        Same as calling ibkr_start_market_data_resource for each contract, with a
+        single connection check. Useful to start a watchlist in one call.
+        
+        Args:
+            contracts: Contracts to stream, each with symbol, secType, exchange and currency
             
-            try:
-                print(f"[RESOURCE] Entering async for loop for {resource_id}")
-                async for data in tws.stream_market_data(req):
-                    print(f"[RESOURCE] Received data for {resource_id}: {data}")
-                    if data:
-                        # Update cache
-                        _market_data_cache[resource_id]["data"] = data
-                        _market_data_cache[resource_id]["timestamp"] = asyncio.get_event_loop().time()
-                        
-                        # Notify all subscribed clients that resource changed
-                        await ctx.session.send_resource_updated(f"ibkr://market-data/{resource_id}")
-                        
-                        print(f"[RESOURCE] Updated {resource_id}: {list(data.keys())} - notification sent")
-            except asyncio.CancelledError:
-                print(f"[RESOURCE] Stream cancelled for {resource_id}")
-            except Exception as e:
-                print(f"[RESOURCE] Stream error for {resource_id}: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        task = asyncio.create_task(stream_to_resource())
-        _resource_background_streams[resource_id] = task
-        _market_data_resource_subscriptions.add(resource_id)
-        
-        return json.dumps({
-            "status": "subscribed",
-            "resource_uri": f"ibkr://market-data/{resource_id}",
-            "resource_id": resource_id,
-            "message": f"Market data streaming started. Subscribe to resource 'ibkr://market-data/{resource_id}' to receive updates.",
-            "contract": {
-                "symbol": symbol,
-                "secType": secType,
-                "exchange": exchange,
-                "currency": currency
-            }
-        })
+        Returns:
+            JSON with the subscription status for each contract, in request order
+        """
+        tws = ctx.request_context.lifespan_context.tws
+        
+        if not tws or not tws.is_connected():
+            return orjson.dumps({
+                "error": "TWS client not connected",
+                "message": "Call ibkr_connect first"
+            }).decode()
+        
+        results = [_start_market_data_stream(ctx.session, tws, req) for req in contracts]
+        return orjson.dumps({"count": len(results), "results": results}).decode()
     
     @mcp.tool()
-    async def ibkr_stop_market_data_resource(resource_id: str) -> str:
+    async def ibkr_stop_market_data_resource(
+        ctx: Context[ServerSession, AppContext],
+        resource_id: str
+    ) -> str:
         """Stop streaming market data to a resource.
         
-        Cancels the background task and clears cached data for a resource.
+        Detaches this session from the stream. When no other session is still
+        using it, cancels the background task and clears cached data for the resource.
         
         Args:
             resource_id: Resource identifier (e.g., "AAPL", "USD.JPY", "EUR.USD")
@@ -195,29 +310,34 @@ def register_market_data_resource(mcp: FastMCP):
         Returns:
             JSON with status
         """
-        if resource_id not in _resource_background_streams:
-            return json.dumps({
+        entry = _market_streams.get(resource_id)
+        if entry is None:
+            return orjson.dumps({
                 "error": f"No active stream for {resource_id}",
                 "subscribed": False
-            })
+            }).decode()
         
-        # Cancel background task
-        task = _resource_background_streams[resource_id]
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
+        entry.subscribers.discard(ctx.session)
+        if entry.subscribers:
+            return orjson.dumps({
+                "status": "unsubscribed",
+                "resource_id": resource_id,
+                "subscribers": len(entry.subscribers),
+                "message": f"Stopped notifications for {resource_id}; stream kept for other sessions"
+            }).decode()
         
-        # Cleanup
-        del _resource_background_streams[resource_id]
-        _market_data_resource_subscriptions.remove(resource_id)
-        del _market_data_cache[resource_id]
+        # Cancel background task. Cleanup runs in finally, so cancelling this call
+        # part-way still releases the resource and lets it be started again.
+        try:
+            await stop_stream_task(entry.task)
+        finally:
+            if _market_streams.get(resource_id) is entry:
+                del _market_streams[resource_id]
         
-        print(f"[RESOURCE] Stopped stream for {resource_id}")
+        logger.info("[RESOURCE] Stopped stream for %s", resource_id)
         
-        return json.dumps({
+        return orjson.dumps({
             "status": "stopped",
             "resource_id": resource_id,
             "message": f"Market data streaming stopped for {resource_id}"
-        })
+        }).decode()
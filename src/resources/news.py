@@ -1,31 +1,386 @@
 """News streaming resources."""
 
 import asyncio
-import json
-import time
-from typing import Dict, Any, List, Set, Optional
+import functools
+import heapq
+import itertools
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from time import time_ns
+from typing import Callable, Dict, Any, Deque, List, Optional, Tuple, Union
+import orjson
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.session import ServerSession
-from ib_async import Contract
-from ..models import AppContext, ContractRequest
+from ib_async import Contract, Forex, NewsTick, Stock
+from ..models import AppContext, BroadTapeNewsItem, ContractRequest, TickNewsItem, TickNewsManager
+from ._tasks import stop_stream_task, task_status
 
+logger = logging.getLogger(__name__)
 
-# Global state for news bulletins resource
-_news_cache: Dict[str, Any] = {"bulletins": [], "timestamp": 0}
+# Pre-serialized responses for fixed error conditions
+_ERR_NOT_CONNECTED = orjson.dumps({
+    "error": "TWS client not connected",
+    "message": "Call ibkr_connect first"
+}).decode()
+_ERR_NEWS_NOT_SUBSCRIBED = orjson.dumps({
+    "error": "News bulletins not subscribed",
+    "message": "Call ibkr_start_news_resource() first to start streaming",
+    "subscribed": False
+}).decode()
+_ERR_NO_NEWS_STREAM = orjson.dumps({
+    "error": "No active news bulletins stream",
+    "subscribed": False
+}).decode()
+_ERR_NO_TICK_NEWS = orjson.dumps({
+    "error": "No tick news subscriptions active",
+    "message": "Call ibkr_start_tick_news_resource() first",
+    "subscribed": False
+}).decode()
+_ERR_BROADTAPE_NOT_SUBSCRIBED = orjson.dumps({
+    "error": "BroadTape news not streaming",
+    "message": "Call ibkr_start_broadtape_news_resource() first to start streaming",
+    "subscribed": False
+}).decode()
+_ERR_NO_BROADTAPE_STREAM = orjson.dumps({
+    "error": "BroadTape news not streaming",
+    "subscribed": False
+}).decode()
+
+# Maximum number of bulletins/headlines retained per cache (oldest are evicted first)
+_NEWS_BULLETINS_MAXLEN = 1000
+_TICK_NEWS_MAXLEN = 100
+_BROADTAPE_NEWS_MAXLEN = 1000
+
+# Headlines older than this (seconds) are dropped from the tick news and BroadTape caches
+_NEWS_TTL = 24 * 60 * 60
+
+# Global state for news bulletins resource. "json" holds the serialized resource; it is
+# cleared whenever the bulletins change and serialized again on the next read.
+# "timestamp" (the resource's last_update) is event loop time, like every resource's
+# last_update; headline timestamps in the tick news and BroadTape caches are epoch seconds.
+_news_cache: Dict[str, Any] = {"bulletins": deque(maxlen=_NEWS_BULLETINS_MAXLEN), "timestamp": 0, "json": None}
 _news_resource_subscription: bool = False
 _news_background_stream: Optional[asyncio.Task] = None
 
-# Global state for tick news
-_tick_news_cache: Dict[str, List[dict]] = {}  # symbol -> list of news items
-_tick_news_subscriptions: Set[str] = set()  # Set of subscribed symbols
-_tick_news_background_tasks: Dict[str, asyncio.Task] = {}  # symbol -> background task
-_tick_news_all_stream: bool = False  # Whether we're streaming all news
+# Limits on tick news streaming resources
+_TICK_NEWS_MAX_SUBSCRIPTIONS = 50  # Maximum number of symbols streaming at once
+_TICK_NEWS_PENDING_MAXLEN = 256  # Maximum headlines waiting for the dispatcher before dropping the oldest
+
+# Recent (providerCode, articleId) keys remembered per feed; IB re-sends some headlines
+_SEEN_ARTICLES_MAXLEN = 256
+
+# Minimum time (seconds) between notifications for a resource. The first headline after a
+# quiet spell is sent at once; those arriving during the interval are sent together after it.
+_NEWS_NOTIFY_INTERVAL = 0.05
+
+# News providers with a BroadTape (all headlines) feed
+_BROADTAPE_PROVIDERS = frozenset({"BRFG", "FLY", "BZ", "DJ", "DJNL", "DJTOP"})
+
+# An idle tick news or BroadTape stream still expires old headlines this often (seconds)
+_NEWS_SWEEP_INTERVAL = 60
+
 
 # Global state for broadtape news
-_broadtape_news_cache: List[Dict[str, Any]] = []
+_broadtape_news_cache: Deque[BroadTapeNewsItem] = deque(maxlen=_BROADTAPE_NEWS_MAXLEN)
+_broadtape_seen_articles: Dict[Tuple[str, str], None] = {}
 _broadtape_news_subscribed: bool = False
 _broadtape_news_task: Optional[asyncio.Task] = None
 _broadtape_provider_tickers: List[Any] = []
+_broadtape_news_json: Optional[str] = None  # Serialized resource, cleared whenever the cache changes
+
+
+def list_news_streams(app_ctx: AppContext) -> Dict[str, List[Dict[str, Any]]]:
+    """Describe the active news bulletin, tick news and BroadTape streams."""
+    tick_news = app_ctx.tick_news
+    
+    news_streams = []
+    if _news_resource_subscription:
+        news_streams.append({
+            "resource_uri": "ibkr://news-bulletins",
+            "bulletin_count": len(_news_cache["bulletins"]),
+            "last_update": _news_cache["timestamp"],
+            "status": task_status(_news_background_stream)
+        })
+    
+    tick_news_streams = [
+        {
+            "symbol": symbol,
+            "resource_uri": f"ibkr://tick-news/{symbol}",
+            "news_count": len(tick_news.cache.get(symbol, ())),
+            "status": task_status(tick_news.tasks.get(symbol))
+        }
+        for symbol in tick_news.subscriptions_view
+    ]
+    if tick_news.all_stream:
+        tick_news_streams.append({
+            "symbol": "*",
+            "resource_uri": "ibkr://tick-news/*",
+            "news_count": sum(len(news_list) for news_list in tick_news.cache.values()),
+            "status": "aggregating"
+        })
+    
+    broadtape_streams = []
+    if _broadtape_news_subscribed:
+        broadtape_streams.append({
+            "resource_uri": "ibkr://broadtape-news",
+            "provider_count": len(_broadtape_provider_tickers),
+            "news_count": len(_broadtape_news_cache),
+            "status": task_status(_broadtape_news_task)
+        })
+    
+    return {"news": news_streams, "tick_news": tick_news_streams, "broadtape_news": broadtape_streams}
+
+
+def _evict_expired(news_list: Deque[Union[TickNewsItem, BroadTapeNewsItem]], now: int) -> int:
+    """Drop headlines older than _NEWS_TTL from a cache and return how many were dropped.
+    
+    Items are appended in arrival order, so expired ones are always at the left end.
+    """
+    cutoff = now - _NEWS_TTL
+    evicted = 0
+    while news_list and news_list[0].timestamp < cutoff:
+        news_list.popleft()
+        evicted += 1
+    return evicted
+
+
+def _first_sighting(seen: Dict[Tuple[str, str], None], news_tick: NewsTick) -> bool:
+    """Record news_tick's article in seen and return whether it was new.
+    
+    seen is used as an insertion-ordered set: once it holds _SEEN_ARTICLES_MAXLEN
+    keys the oldest is forgotten, so memory stays bounded on long-running feeds.
+    """
+    key = (news_tick.providerCode, news_tick.articleId)
+    if key in seen:
+        return False
+    seen[key] = None
+    if len(seen) > _SEEN_ARTICLES_MAXLEN:
+        del seen[next(iter(seen))]
+    return True
+
+
+def _news_tick_time(news_tick: NewsTick) -> Optional[str]:
+    """Format a news tick's time (milliseconds since the epoch) as an ISO 8601 string."""
+    if not news_tick.timeStamp:
+        return None
+    return datetime.fromtimestamp(news_tick.timeStamp / 1000, timezone.utc).isoformat()
+
+
+def _make_tick_news_item(symbol: str, news_tick: NewsTick, timestamp: int) -> TickNewsItem:
+    """Convert a raw tick news event for symbol into the cached news item."""
+    return TickNewsItem(
+        symbol,
+        _news_tick_time(news_tick),
+        news_tick.providerCode,
+        news_tick.articleId,
+        news_tick.headline,
+        news_tick.extraData,
+        timestamp
+    )
+
+
+class _TickNewsRouter:
+    """Delivers the news ticks of one IB connection to handlers, by the ticker they arrive on.
+    
+    ib_async reports news ticks only through ib.tickNewsEvent, without the market
+    data request they came from, and Ticker has no news event of its own. The router
+    is installed as the tickNews callback of the connection's wrapper: it still calls
+    the wrapper's own method, so tickNewsEvent subscribers see every tick, then finds
+    the tick's ticker by request id and its handler with one dict lookup. Tickers
+    hash by identity and are held as keys, so a route can never match another ticker.
+    """
+    __slots__ = ("wrapper", "original", "routes")
+    
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+        self.original = wrapper.tickNews
+        self.routes: Dict[Any, Callable[[NewsTick], None]] = {}
+    
+    def tickNews(self, reqId, timeStamp, providerCode, articleId, headline, extraData):
+        self.original(reqId, timeStamp, providerCode, articleId, headline, extraData)
+        route = self.routes.get(self.wrapper.reqId2Ticker.get(reqId))
+        if route is not None:
+            route(NewsTick(timeStamp, providerCode, articleId, headline, extraData))
+
+
+def _installed_router(ib) -> Optional[_TickNewsRouter]:
+    """Return the router installed on ib's wrapper, if any."""
+    router = getattr(vars(ib.wrapper).get("tickNews"), "__self__", None)
+    return router if isinstance(router, _TickNewsRouter) else None
+
+
+def _attach_tick_news_route(ib, ticker, handler: Callable[[NewsTick], None]) -> None:
+    """Deliver the news ticks that arrive on ticker to handler, installing ib's router if needed."""
+    router = _installed_router(ib)
+    if router is None:
+        router = _TickNewsRouter(ib.wrapper)
+        ib.wrapper.tickNews = router.tickNews
+    router.routes[ticker] = handler
+
+
+def _detach_tick_news_route(ib, ticker) -> None:
+    """Stop delivering news ticks for ticker, removing ib's router after its last route."""
+    router = _installed_router(ib)
+    if router is None:
+        return
+    router.routes.pop(ticker, None)
+    if not router.routes:
+        remove_tick_news_router(ib)
+
+
+def remove_tick_news_router(ib) -> None:
+    """Drop all news tick routes of ib and restore its wrapper's own tickNews callback.
+    
+    Called when a session ends, so no route outlives the streams of its connection.
+    """
+    if ib is not None and _installed_router(ib) is not None:
+        del ib.wrapper.tickNews
+
+
+def _forget_tick_news_task(tick_news: TickNewsManager, symbol: str, task: asyncio.Task) -> None:
+    """Drop a tick news stream's bookkeeping once its task finishes on its own.
+    
+    Stopped streams are popped before they are cancelled, so this only acts on
+    tasks that ended by themselves (e.g. the contract failed to qualify) and
+    would otherwise stay referenced along with their ticker and contract. The
+    dispatcher is stopped too once no symbol is left for it.
+    """
+    if tick_news.tasks.get(symbol) is not task:
+        return
+    del tick_news.tasks[symbol]
+    tick_news.subscriptions.discard(symbol)
+    tick_news.subscriptions_view = tuple(tick_news.subscriptions)
+    tick_news.uris.pop(symbol, None)
+    tick_news.cache.pop(symbol, None)
+    tick_news.seen_articles.pop(symbol, None)
+    tick_news.json.clear()
+    if not tick_news.subscriptions and tick_news.dispatch_task is not None:
+        tick_news.dispatch_task.cancel()
+        tick_news.dispatch_task = None
+        tick_news.pending = None
+        tick_news.wakeup = None
+
+
+def _cancel_broadtape_tickers(ib) -> None:
+    """Cancel the market data subscriptions of all BroadTape provider tickers.
+    
+    The cancel requests are written back to back without yielding to the event loop,
+    so they go out to TWS together. The ticker list is swapped out first, making a
+    second call (stream cancellation followed by the stop tool) a no-op.
+    
+    Each subscription is cancelled individually on purpose: ib.reqGlobalCancel()
+    cancels all open orders, not market data, and must never be used here.
+    """
+    global _broadtape_provider_tickers, _broadtape_news_json
+    tickers, _broadtape_provider_tickers = _broadtape_provider_tickers, []
+    _broadtape_news_json = None
+    
+    # Subscriptions die with the connection, so there is nothing to cancel once it is gone
+    if not tickers or not ib.isConnected():
+        return
+    
+    for ticker in tickers:
+        try:
+            ib.cancelMktData(ticker.contract)
+        except (ConnectionError, AttributeError) as e:
+            logger.warning("[BROADTAPE NEWS] Failed to cancel market data for %s: %s",
+                           getattr(ticker, "contract", ticker), e)
+
+
+async def _dispatch_tick_news(tick_news: TickNewsManager):
+    """Single consumer that caches tick news and sends notifications for all symbols of a session.
+    
+    The ib_async callbacks only append the raw news ticks to a deque, keeping the
+    IB event dispatch path short; this task builds the news items and updates the
+    caches. Headlines from every symbol share one deque, so a burst of news wakes
+    one task instead of one task per symbol. After each batch the task waits
+    _NEWS_NOTIFY_INTERVAL, so headlines arriving meanwhile are taken together by
+    swapping the deque, and each batch sends one notification per affected symbol,
+    plus one for '*' when aggregation is enabled.
+    """
+    cache = tick_news.cache
+    seen_articles = tick_news.seen_articles
+    wakeup = tick_news.wakeup
+    
+    while True:
+        # Sleep until a headline arrives, then take everything queued so far.
+        # A quiet feed still wakes every _NEWS_SWEEP_INTERVAL to expire old headlines.
+        try:
+            await asyncio.wait_for(wakeup.wait(), _NEWS_SWEEP_INTERVAL)
+        except asyncio.TimeoutError:
+            timestamp = time_ns() // 1_000_000_000
+            evicted = 0
+            for news_list in cache.values():
+                evicted += _evict_expired(news_list, timestamp)
+            if evicted:
+                tick_news.json.clear()
+            continue
+        wakeup.clear()
+        batch, tick_news.pending = tick_news.pending, deque(maxlen=_TICK_NEWS_PENDING_MAXLEN)
+        
+        # Add to cache (the deque evicts the oldest item when full), skipping re-sent headlines
+        timestamp = time_ns() // 1_000_000_000
+        updated = {}
+        for symbol, news_tick in batch:
+            news_list = cache.get(symbol)
+            if news_list is None:
+                continue  # Unsubscribed since the headline was queued
+            if not _first_sighting(seen_articles[symbol], news_tick):
+                continue
+            news_item = _make_tick_news_item(symbol, news_tick, timestamp)
+            news_list.append(news_item)
+            updated[symbol] = None
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[TICK NEWS] %s: %s...", symbol, (news_item.headline or '')[:80])
+        
+        # Expire old headlines for every symbol, including ones that have gone quiet
+        evicted = 0
+        for news_list in cache.values():
+            evicted += _evict_expired(news_list, timestamp)
+        if updated or evicted:
+            tick_news.json.clear()
+        if not updated:
+            continue  # Only re-sent headlines, nothing to notify
+        
+        # Collect the resources to notify, then send them all concurrently
+        resource_uris = [
+            tick_news.uris[symbol]
+            for symbol in updated
+            if symbol in tick_news.uris  # Absent when unsubscribed since the headline was queued
+        ]
+        if resource_uris and tick_news.all_stream:
+            resource_uris.append("ibkr://tick-news/*")
+        
+        session = tick_news.session
+        results = await asyncio.gather(
+            *(session.send_resource_updated(resource_uri) for resource_uri in resource_uris),
+            return_exceptions=True
+        )
+        for resource_uri, result in zip(resource_uris, results):
+            if isinstance(result, Exception):
+                logger.warning("[TICK NEWS] Failed to notify %s: %s", resource_uri, result)
+        await asyncio.sleep(_NEWS_NOTIFY_INTERVAL)
+
+
+def _ensure_tick_news_dispatcher(tick_news: TickNewsManager):
+    """Start the session's tick news dispatcher if it is not already running."""
+    if tick_news.dispatch_task is None or tick_news.dispatch_task.done():
+        tick_news.pending = deque(maxlen=_TICK_NEWS_PENDING_MAXLEN)
+        tick_news.wakeup = asyncio.Event()
+        tick_news.dispatch_task = asyncio.create_task(_dispatch_tick_news(tick_news))
+
+
+async def _stop_tick_news_dispatcher(tick_news: TickNewsManager):
+    """Stop the session's tick news dispatcher once no symbols are subscribed."""
+    if tick_news.subscriptions or tick_news.dispatch_task is None:
+        return
+    
+    task, tick_news.dispatch_task = tick_news.dispatch_task, None
+    await stop_stream_task(task)
+    tick_news.pending = None
+    tick_news.wakeup = None
 
 
 def register_news_resource(mcp: FastMCP):
@@ -49,18 +404,16 @@ def register_news_resource(mcp: FastMCP):
             JSON string with news bulletins
         """
         if not _news_resource_subscription:
-            return json.dumps({
-                "error": "News bulletins not subscribed",
-                "message": "Call ibkr_start_news_resource() first to start streaming",
-                "subscribed": False
-            })
+            return _ERR_NEWS_NOT_SUBSCRIBED
         
-        return json.dumps({
-            "subscribed": True,
-            "bulletins": _news_cache.get("bulletins", []),
-            "last_update": _news_cache.get("timestamp", 0),
-            "count": len(_news_cache.get("bulletins", []))
-        })
+        if _news_cache["json"] is None:
+            _news_cache["json"] = orjson.dumps({
+                "subscribed": True,
+                "bulletins": list(_news_cache["bulletins"]),
+                "last_update": _news_cache["timestamp"],
+                "count": len(_news_cache["bulletins"])
+            }).decode()
+        return _news_cache["json"]
     
     @mcp.tool()
     async def ibkr_start_news_resource(
@@ -83,74 +436,84 @@ def register_news_resource(mcp: FastMCP):
         tws = ctx.request_context.lifespan_context.tws
         
         if not tws or not tws.is_connected():
-            return json.dumps({
-                "error": "TWS client not connected",
-                "message": "Call ibkr_connect first"
-            })
+            return _ERR_NOT_CONNECTED
         
         if _news_resource_subscription:
-            return json.dumps({
+            return orjson.dumps({
                 "status": "already_subscribed",
                 "resource_uri": "ibkr://news-bulletins",
                 "message": "News bulletins already streaming"
-            })
+            }).decode()
         
         # Initialize cache
-        _news_cache["bulletins"] = []
+        _news_cache["bulletins"].clear()
         _news_cache["timestamp"] = 0
+        _news_cache["json"] = None
         
         # Start background streaming task
         async def stream_to_resource():
             """Background task that updates the news resource."""
-            print(f"[NEWS RESOURCE] Starting news bulletins stream (allMessages={allMessages})")
+            logger.info("[NEWS RESOURCE] Starting news bulletins stream (allMessages=%s)", allMessages)
+            
+            # Bulletins not yet cached, and a flag telling the loop below there are some
+            pending: Deque[Dict[str, Any]] = deque()
+            wakeup = asyncio.Event()
+            
+            def on_news_bulletin(bulletin):
+                """Collect each new bulletin; the loop below appends it to the cache."""
+                pending.append({
+                    "msgId": bulletin.msgId,
+                    "msgType": bulletin.msgType,
+                    "message": bulletin.message,
+                    "origExchange": bulletin.origExchange
+                })
+                wakeup.set()
+            
+            loop_time = asyncio.get_running_loop().time
             
+            # Attach before subscribing so no bulletin is missed
+            tws.ib.newsBulletinEvent += on_news_bulletin
             try:
                 # Subscribe to news bulletins
                 await tws.subscribe_news_bulletins(allMessages)
                 
-                # Use event-driven approach instead of polling
-                # Wait for newsBulletinEvent which fires when news arrives
                 while True:
-                    # Wait for any news bulletin event
-                    await tws.ib.newsBulletinEvent
+                    # Sleep until a bulletin arrives, then take everything queued so far
+                    await wakeup.wait()
+                    wakeup.clear()
+                    batch, pending = pending, deque()
                     
-                    # Get all current bulletins
-                    if hasattr(tws.ib, 'newsBulletins') and tws.ib.newsBulletins():
-                        bulletins = list(tws.ib.newsBulletins())
-                        
-                        # Update cache with all bulletins
-                        _news_cache["bulletins"] = [
-                            {
-                                "msgId": b.msgId,
-                                "msgType": b.msgType,
-                                "message": b.message,
-                                "origExchange": b.origExchange
-                            }
-                            for b in bulletins
-                        ]
-                        _news_cache["timestamp"] = asyncio.get_event_loop().time()
-                        
-                        # Notify clients
+                    # Append only the new bulletins (the deque evicts the oldest when full)
+                    _news_cache["bulletins"].extend(batch)
+                    _news_cache["timestamp"] = loop_time()
+                    _news_cache["json"] = None
+                    
+                    # Notify clients; a failed notification must not end the stream
+                    try:
                         await ctx.session.send_resource_updated("ibkr://news-bulletins")
-                        print(f"[NEWS RESOURCE] Updated with {len(bulletins)} bulletins - notification sent")
+                    except Exception as e:
+                        logger.warning("[NEWS RESOURCE] Failed to notify: %s", e)
+                    logger.debug("[NEWS RESOURCE] Added %d bulletins - notification sent", len(batch))
+                    await asyncio.sleep(_NEWS_NOTIFY_INTERVAL)
                     
             except asyncio.CancelledError:
-                print(f"[NEWS RESOURCE] Stream cancelled")
+                logger.info("[NEWS RESOURCE] Stream cancelled")
             except Exception as e:
-                print(f"[NEWS RESOURCE] Stream error: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[NEWS RESOURCE] Stream error: %s", e)
+            finally:
+                # Detach the handler so ib_async does not retain the closure and its queue
+                tws.ib.newsBulletinEvent -= on_news_bulletin
         
         task = asyncio.create_task(stream_to_resource())
         _news_background_stream = task
         _news_resource_subscription = True
         
-        return json.dumps({
+        return orjson.dumps({
             "status": "subscribed",
             "resource_uri": "ibkr://news-bulletins",
             "message": "News bulletins streaming started",
             "allMessages": allMessages
-        })
+        }).decode()
     
     @mcp.tool()
     async def ibkr_stop_news_resource() -> str:
@@ -162,36 +525,34 @@ def register_news_resource(mcp: FastMCP):
         global _news_resource_subscription, _news_background_stream
         
         if not _news_resource_subscription:
-            return json.dumps({
-                "error": "No active news bulletins stream",
-                "subscribed": False
-            })
-        
-        # Cancel background task
-        if _news_background_stream:
-            _news_background_stream.cancel()
-            try:
-                await _news_background_stream
-            except asyncio.CancelledError:
-                pass
-        
-        # Cleanup
-        _news_background_stream = None
-        _news_resource_subscription = False
-        _news_cache["bulletins"] = []
-        _news_cache["timestamp"] = 0
-        
-        print(f"[NEWS RESOURCE] Stopped stream")
-        
-        return json.dumps({
+            return _ERR_NO_NEWS_STREAM
+        
+        # Cancel background task. Cleanup runs in finally, so cancelling this call
+        # part-way still releases the stream.
+        try:
+            if _news_background_stream:
+                await stop_stream_task(_news_background_stream)
+        finally:
+            _news_background_stream = None
+            _news_resource_subscription = False
+            _news_cache["bulletins"].clear()
+            _news_cache["timestamp"] = 0
+            _news_cache["json"] = None
+        
+        logger.info("[NEWS RESOURCE] Stopped stream")
+        
+        return orjson.dumps({
             "status": "stopped",
             "message": "News bulletins streaming stopped"
-        })
+        }).decode()
     
     # --- Tick News Resource ---
     
     @mcp.resource("ibkr://tick-news/{symbol}")
-    async def get_tick_news_resource(symbol: str) -> str:
+    async def get_tick_news_resource(
+        symbol: str,
+        ctx: Context[ServerSession, AppContext]
+    ) -> str:
         """Get real-time news headlines for a symbol.
         
         This provides the same news you see in TWS Station's News tab.
@@ -211,50 +572,58 @@ def register_news_resource(mcp: FastMCP):
         Returns:
             JSON string with news headlines
         """
+        tick_news = ctx.request_context.lifespan_context.tick_news
+        
         if symbol == "*":
             # Return all news from all subscribed symbols
-            if not _tick_news_all_stream and not _tick_news_subscriptions:
-                return json.dumps({
-                    "error": "No tick news subscriptions active",
-                    "message": "Call ibkr_start_tick_news_resource() first",
-                    "subscribed": False
-                })
+            if not tick_news.all_stream and not tick_news.subscriptions:
+                return _ERR_NO_TICK_NEWS
             
-            # Aggregate all news
-            all_news = []
-            for sym, news_list in _tick_news_cache.items():
-                for item in news_list:
-                    item_with_symbol = item.copy()
-                    item_with_symbol["symbol"] = sym
-                    all_news.append(item_with_symbol)
+            cached = tick_news.json.get("*")
+            if cached is not None:
+                return cached
             
-            # Sort by timestamp descending
-            all_news.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
+            # Each symbol's deque is in arrival (timestamp) order, so merging them newest
+            # first and stopping after 100 items only visits the items that are kept.
+            # Items already carry their symbol, so they are returned as they are.
+            latest_news = list(itertools.islice(
+                heapq.merge(
+                    *map(reversed, tick_news.cache.values()),
+                    key=lambda item: -item.timestamp
+                ),
+                100
+            ))
             
-            return json.dumps({
+            cached = tick_news.json["*"] = orjson.dumps({
                 "subscribed": True,
                 "symbol": "*",
-                "news_items": all_news[:100],  # Last 100 items
-                "total_count": len(all_news),
-                "subscribed_symbols": list(_tick_news_subscriptions)
-            })
+                "news_items": latest_news,  # Last 100 items
+                "total_count": sum(len(news_list) for news_list in tick_news.cache.values()),
+                "subscribed_symbols": tick_news.subscriptions_view
+            }).decode()
+            return cached
         
         # Symbol-specific news
-        if symbol not in _tick_news_subscriptions:
-            return json.dumps({
+        if symbol not in tick_news.subscriptions:
+            return orjson.dumps({
                 "error": f"Not subscribed to tick news for {symbol}",
                 "message": f"Call ibkr_start_tick_news_resource(symbol='{symbol}') first",
                 "subscribed": False
-            })
+            }).decode()
         
-        news_items = _tick_news_cache.get(symbol, [])
+        cached = tick_news.json.get(symbol)
+        if cached is not None:
+            return cached
         
-        return json.dumps({
+        news_items = tick_news.cache.get(symbol, ())
+        
+        cached = tick_news.json[symbol] = orjson.dumps({
             "subscribed": True,
             "symbol": symbol,
-            "news_items": news_items[-50:],  # Last 50 items
+            "news_items": list(itertools.islice(news_items, max(0, len(news_items) - 50), None)),  # Last 50 items
             "count": len(news_items)
-        })
+        }).decode()
+        return cached
     
     @mcp.tool()
     async def ibkr_start_tick_news_resource(
@@ -288,58 +657,62 @@ def register_news_resource(mcp: FastMCP):
         Returns:
             JSON with resource URI and subscription status
         """
-        global _tick_news_all_stream
-        
-        tws = ctx.request_context.lifespan_context.tws
+        app_ctx = ctx.request_context.lifespan_context
+        tws = app_ctx.tws
+        tick_news = app_ctx.tick_news
         
         if not tws or not tws.is_connected():
-            return json.dumps({
-                "error": "TWS client not connected",
-                "message": "Call ibkr_connect first"
-            })
+            return _ERR_NOT_CONNECTED
         
         # Handle "all news" subscription
         if symbol == "*":
-            if _tick_news_all_stream:
-                return json.dumps({
+            if tick_news.all_stream:
+                return orjson.dumps({
                     "status": "already_subscribed",
                     "resource_uri": "ibkr://tick-news/*",
                     "message": "All tick news aggregation already enabled",
-                    "subscribed_symbols": list(_tick_news_subscriptions),
+                    "subscribed_symbols": tick_news.subscriptions_view,
                     "note": "This aggregates news from subscribed symbols. No new subscriptions created."
-                })
+                }).decode()
             
-            _tick_news_all_stream = True
+            tick_news.all_stream = True
             
-            return json.dumps({
+            return orjson.dumps({
                 "status": "subscribed",
                 "resource_uri": "ibkr://tick-news/*",
                 "message": "Aggregation mode enabled. This collects news from all subscribed symbols.",
-                "subscribed_symbols": list(_tick_news_subscriptions),
+                "subscribed_symbols": tick_news.subscriptions_view,
                 "note": "To receive news, subscribe to actual symbols: ibkr_start_tick_news_resource(symbol='AAPL')",
                 "warning": "No new symbol subscriptions created. Use specific symbols (e.g. 'AAPL') to subscribe."
-            })
+            }).decode()
         
         # Symbol-specific subscription
-        if symbol in _tick_news_subscriptions:
-            return json.dumps({
+        if symbol in tick_news.subscriptions:
+            return orjson.dumps({
                 "status": "already_subscribed",
                 "resource_uri": f"ibkr://tick-news/{symbol}",
                 "message": f"Tick news for {symbol} already streaming"
-            })
+            }).decode()
+        
+        if len(tick_news.subscriptions) >= _TICK_NEWS_MAX_SUBSCRIPTIONS:
+            return orjson.dumps({
+                "error": "Too many tick news subscriptions",
+                "message": f"At most {_TICK_NEWS_MAX_SUBSCRIPTIONS} symbols can stream tick news at once. "
+                           f"Call ibkr_stop_tick_news_resource() for an unused symbol first.",
+                "subscribed_symbols": tick_news.subscriptions_view
+            }).decode()
         
         # Initialize cache for this symbol
-        _tick_news_cache[symbol] = []
+        tick_news.cache[symbol] = deque(maxlen=_TICK_NEWS_MAXLEN)
+        tick_news.seen_articles[symbol] = {}
         
         # Start background streaming task
         async def stream_tick_news():
             """Background task that streams tick news for a symbol."""
-            print(f"[TICK NEWS] Starting tick news stream for {symbol}")
+            logger.info("[TICK NEWS] Starting tick news stream for %s", symbol)
             
             ticker = None
             try:
-                from ib_async import Stock, Forex
-                
                 # Create IB contract
                 if secType == "STK":
                     contract = Stock(symbol, exchange, currency)
@@ -356,7 +729,7 @@ def register_news_resource(mcp: FastMCP):
                 # Qualify contract
                 qualified = await tws.ib.qualifyContractsAsync(contract)
                 if not qualified:
-                    print(f"[TICK NEWS] Failed to qualify contract for {symbol}")
+                    logger.warning("[TICK NEWS] Failed to qualify contract for %s", symbol)
                     return
                 
                 contract = qualified[0]
@@ -365,71 +738,53 @@ def register_news_resource(mcp: FastMCP):
                 # genericTickList 292 = news
                 ticker = tws.ib.reqMktData(contract, genericTickList='292')
                 
-                # Set up an asyncio queue and event-driven loop
-                news_queue: asyncio.Queue = asyncio.Queue()
-                
                 def on_tick_news(news_tick):
-                    """Handle incoming tick news by enqueueing it for the loop to process."""
-                    news_item = {
-                        "timestamp": int(time.time()),
-                        "time": news_tick.time.isoformat() if hasattr(news_tick, 'time') else None,
-                        "providerCode": getattr(news_tick, 'providerCode', None),
-                        "articleId": getattr(news_tick, 'articleId', None),
-                        "headline": getattr(news_tick, 'headline', None),
-                        "extraData": getattr(news_tick, 'extraData', None)
-                    }
-                    
-                    # Add to cache immediately
-                    if symbol not in _tick_news_cache:
-                        _tick_news_cache[symbol] = []
-                    _tick_news_cache[symbol].append(news_item)
-                    if len(_tick_news_cache[symbol]) > 100:
-                        _tick_news_cache[symbol] = _tick_news_cache[symbol][-100:]
+                    """Hand incoming tick news to the shared dispatcher.
                     
-                    # Enqueue for processing
-                    try:
-                        news_queue.put_nowait(news_item)
-                    except Exception:
-                        pass
-                    
-                    print(f"[TICK NEWS] {symbol}: {news_item.get('headline', '')[:80]}...")
+                    Runs inside ib_async's event dispatch, so it does no more than
+                    append the raw tick; the bounded deque drops the oldest if the
+                    dispatcher is behind.
+                    """
+                    pending = tick_news.pending
+                    if pending is None:
+                        return
+                    pending.append((symbol, news_tick))
+                    tick_news.wakeup.set()
                 
-                # Attach event handler
-                ticker.tickNewsEvent += on_tick_news
+                # Route this ticker's news ticks to the handler
+                _attach_tick_news_route(tws.ib, ticker, on_tick_news)
+                
+                # Notifications are sent by the shared dispatcher; keep the
+                # subscription alive until the stream is cancelled
+                await asyncio.get_running_loop().create_future()
                 
-                # Event-driven processing loop
-                while True:
-                    # Wait for IB to process events
-                    await tws.ib.updateEvent
-                    
-                    # Drain the queue
-                    drained = False
-                    while not news_queue.empty():
-                        item = news_queue.get_nowait()
-                        drained = True
-                        # Notify subscribed clients
-                        await ctx.session.send_resource_updated(f"ibkr://tick-news/{symbol}")
-                        if _tick_news_all_stream:
-                            await ctx.session.send_resource_updated("ibkr://tick-news/*")
-                    
-                    # If drained anything, small sleep to batch notifications
-                    if drained:
-                        await asyncio.sleep(0.01)
-                    
             except asyncio.CancelledError:
-                print(f"[TICK NEWS] Stream cancelled for {symbol}")
-                if ticker:
-                    tws.ib.cancelMktData(contract)
+                logger.info("[TICK NEWS] Stream cancelled for %s", symbol)
             except Exception as e:
-                print(f"[TICK NEWS] Stream error for {symbol}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[TICK NEWS] Stream error for %s: %s", symbol, e)
+            finally:
+                # Release the subscription however the stream ended, and drop the
+                # route so it does not retain the closure
+                if ticker is not None:
+                    _detach_tick_news_route(tws.ib, ticker)
+                    if tws.ib.isConnected():
+                        try:
+                            tws.ib.cancelMktData(ticker.contract)
+                        except (ConnectionError, AttributeError) as e:
+                            logger.warning("[TICK NEWS] Failed to cancel market data for %s: %s", symbol, e)
+        
+        tick_news.session = ctx.session
+        tick_news.uris[symbol] = f"ibkr://tick-news/{symbol}"
+        _ensure_tick_news_dispatcher(tick_news)
         
         task = asyncio.create_task(stream_tick_news())
-        _tick_news_background_tasks[symbol] = task
-        _tick_news_subscriptions.add(symbol)
+        tick_news.tasks[symbol] = task
+        task.add_done_callback(functools.partial(_forget_tick_news_task, tick_news, symbol))
+        tick_news.subscriptions.add(symbol)
+        tick_news.subscriptions_view = tuple(tick_news.subscriptions)
+        tick_news.json.clear()
         
-        return json.dumps({
+        return orjson.dumps({
             "status": "subscribed",
             "resource_uri": f"ibkr://tick-news/{symbol}",
             "message": f"Tick news streaming started for {symbol}",
@@ -439,10 +794,13 @@ def register_news_resource(mcp: FastMCP):
                 "exchange": exchange,
                 "currency": currency
             }
-        })
+        }).decode()
     
     @mcp.tool()
-    async def ibkr_stop_tick_news_resource(symbol: str) -> str:
+    async def ibkr_stop_tick_news_resource(
+        ctx: Context[ServerSession, AppContext],
+        symbol: str
+    ) -> str:
         """Stop streaming tick news for a symbol.
         
         Args:
@@ -451,58 +809,59 @@ def register_news_resource(mcp: FastMCP):
         Returns:
             JSON with status
         """
-        global _tick_news_all_stream
+        tick_news = ctx.request_context.lifespan_context.tick_news
         
         if symbol == "*":
-            # Stop all subscriptions
-            for sym in list(_tick_news_subscriptions):
-                if sym in _tick_news_background_tasks:
-                    task = _tick_news_background_tasks[sym]
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-                    del _tick_news_background_tasks[sym]
+            # Stop all subscriptions. Cleanup runs in finally, so cancelling this call
+            # part-way still releases every symbol.
+            symbols = list(tick_news.subscriptions)
+            tasks = [tick_news.tasks.pop(sym) for sym in symbols if sym in tick_news.tasks]
+            try:
+                await asyncio.gather(*map(stop_stream_task, tasks))
+            finally:
+                for sym in symbols:
+                    tick_news.subscriptions.discard(sym)
+                    tick_news.uris.pop(sym, None)
+                    tick_news.cache.pop(sym, None)
+                    tick_news.seen_articles.pop(sym, None)
                 
-                _tick_news_subscriptions.discard(sym)
-                if sym in _tick_news_cache:
-                    del _tick_news_cache[sym]
-            
-            _tick_news_all_stream = False
+                tick_news.all_stream = False
+                tick_news.subscriptions_view = ()
+                tick_news.json.clear()
+            await _stop_tick_news_dispatcher(tick_news)
             
-            return json.dumps({
+            return orjson.dumps({
                 "status": "stopped",
                 "message": "All tick news streams stopped"
-            })
+            }).decode()
         
-        if symbol not in _tick_news_subscriptions:
-            return json.dumps({
+        if symbol not in tick_news.subscriptions:
+            return orjson.dumps({
                 "error": f"No active tick news stream for {symbol}",
                 "subscribed": False
-            })
-        
-        # Cancel background task
-        if symbol in _tick_news_background_tasks:
-            task = _tick_news_background_tasks[symbol]
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-            del _tick_news_background_tasks[symbol]
-        
-        # Cleanup
-        _tick_news_subscriptions.discard(symbol)
-        if symbol in _tick_news_cache:
-            del _tick_news_cache[symbol]
-        
-        print(f"[TICK NEWS] Stopped stream for {symbol}")
-        
-        return json.dumps({
+            }).decode()
+        
+        # Cancel background task. Cleanup runs in finally, so cancelling this call
+        # part-way still releases the symbol.
+        task = tick_news.tasks.pop(symbol, None)
+        try:
+            if task is not None:
+                await stop_stream_task(task)
+        finally:
+            tick_news.subscriptions.discard(symbol)
+            tick_news.subscriptions_view = tuple(tick_news.subscriptions)
+            tick_news.json.clear()
+            tick_news.uris.pop(symbol, None)
+            tick_news.cache.pop(symbol, None)
+            tick_news.seen_articles.pop(symbol, None)
+        await _stop_tick_news_dispatcher(tick_news)
+        
+        logger.info("[TICK NEWS] Stopped stream for %s", symbol)
+        
+        return orjson.dumps({
             "status": "stopped",
             "message": f"Tick news streaming stopped for {symbol}"
-        })
+        }).decode()
     
     # --- BroadTape News Resource ---
     
@@ -523,19 +882,21 @@ def register_news_resource(mcp: FastMCP):
         Returns:
             JSON string with aggregated news headlines from all providers
         """
+        global _broadtape_news_json
+        
         if not _broadtape_news_subscribed:
-            return json.dumps({
-                "error": "BroadTape news not streaming",
-                "message": "Call ibkr_start_broadtape_news_resource() first to start streaming",
-                "subscribed": False
-            })
+            return _ERR_BROADTAPE_NOT_SUBSCRIBED
         
-        return json.dumps({
-            "subscribed": True,
-            "news_items": _broadtape_news_cache[-100:],  # Last 100 headlines
-            "total_count": len(_broadtape_news_cache),
-            "provider_count": len(_broadtape_provider_tickers)
-        })
+        if _broadtape_news_json is None:
+            _broadtape_news_json = orjson.dumps({
+                "subscribed": True,
+                "news_items": list(itertools.islice(
+                    _broadtape_news_cache, max(0, len(_broadtape_news_cache) - 100), None
+                )),  # Last 100 headlines
+                "total_count": len(_broadtape_news_cache),
+                "provider_count": len(_broadtape_provider_tickers)
+            }).decode()
+        return _broadtape_news_json
     
     @mcp.tool()
     async def ibkr_start_broadtape_news_resource(
@@ -551,157 +912,174 @@ def register_news_resource(mcp: FastMCP):
         Returns:
             JSON with resource URI and subscription status
         """
-        global _broadtape_news_subscribed, _broadtape_news_task, _broadtape_provider_tickers, _broadtape_news_cache
+        global _broadtape_news_subscribed, _broadtape_news_task, _broadtape_provider_tickers, _broadtape_news_json
         
         tws = ctx.request_context.lifespan_context.tws
         
         if not tws or not tws.is_connected():
-            return json.dumps({
-                "error": "TWS client not connected",
-                "message": "Call ibkr_connect first"
-            })
+            return _ERR_NOT_CONNECTED
         
         if _broadtape_news_subscribed:
-            return json.dumps({
+            return orjson.dumps({
                 "status": "already_subscribed",
                 "resource_uri": "ibkr://broadtape-news",
                 "message": "BroadTape news already streaming",
                 "provider_count": len(_broadtape_provider_tickers)
-            })
+            }).decode()
         
         # Start background streaming task
         async def stream_to_resource():
             """Background task that streams news from all providers."""
-            global _broadtape_provider_tickers
+            global _broadtape_provider_tickers, _broadtape_news_json
             
-            print(f"[BROADTAPE NEWS] Starting aggregated news stream")
+            logger.info("[BROADTAPE NEWS] Starting aggregated news stream")
             
+            pending = None
+            tickers = []
             try:
                 # Get available news providers
-                print(f"[BROADTAPE NEWS] Fetching news providers...")
+                logger.info("[BROADTAPE NEWS] Fetching news providers...")
                 providers = await tws.ib.reqNewsProvidersAsync()
-                print(f"[BROADTAPE NEWS] Found {len(providers)} providers: {[p.code for p in providers]}")
+                logger.info("[BROADTAPE NEWS] Found %d providers: %s", len(providers), [p.code for p in providers])
                 
                 if not providers:
-                    print(f"[BROADTAPE NEWS] No news providers available!")
+                    logger.warning("[BROADTAPE NEWS] No news providers available!")
                     return
                 
-                # Create event queue
-                event_queue: asyncio.Queue = asyncio.Queue()
+                # Headlines not yet cached, and a flag telling the loop below there are some
+                pending = deque()
+                wakeup = asyncio.Event()
+                
+                # Build BroadTape contracts for the supported providers
+                provider_codes = []
+                contracts = []
+                for provider in providers:
+                    if provider.code.strip() not in _BROADTAPE_PROVIDERS:
+                        continue
+                    contract = Contract()
+                    contract.symbol = f"{provider.code}:{provider.code}_ALL"
+                    contract.secType = "NEWS"
+                    contract.exchange = provider.code
+                    provider_codes.append(provider.code)
+                    contracts.append(contract)
+                
+                # Qualify all provider contracts concurrently (one round-trip instead of one per provider)
+                logger.info("[BROADTAPE NEWS] Qualifying %d providers: %s", len(contracts), provider_codes)
+                qualified_lists = await asyncio.gather(
+                    *[tws.ib.qualifyContractsAsync(contract) for contract in contracts],
+                    return_exceptions=True
+                )
                 
                 # Subscribe to BroadTape feed for each provider
                 tickers = []
-                for provider in providers:
-                    if provider.code.strip() not in ["BRFG", "FLY", "BZ", "DJ", "DJNL", "DJTOP"]:
+                for provider_code, contract, qualified in zip(provider_codes, contracts, qualified_lists):
+                    if isinstance(qualified, BaseException):
+                        logger.warning("[BROADTAPE NEWS] Failed to subscribe to %s: %s", provider_code, qualified)
                         continue
                     try:
-                        contract = Contract()
-                        contract.symbol = f"{provider.code}:{provider.code}_ALL"
-                        contract.secType = "NEWS"
-                        contract.exchange = provider.code
-                        
-                        print(f"[BROADTAPE NEWS] Subscribing to provider {provider.code}...")
-                        
-                        qualified = await tws.ib.qualifyContractsAsync(contract)
                         if qualified:
                             contract = qualified[0]
-                            contract.exchange = provider.code
-                            print(f"[BROADTAPE NEWS] Qualified {provider.code}: conId={contract.conId}")
+                            contract.exchange = provider_code
+                            logger.info("[BROADTAPE NEWS] Qualified %s: conId=%s", provider_code, contract.conId)
                         
                         ticker = tws.ib.reqMktData(contract, genericTickList='292', snapshot=False, regulatorySnapshot=False)
-                        tickers.append((provider.code, ticker))
+                        tickers.append((provider_code, ticker))
                         
-                        print(f"[BROADTAPE NEWS] Subscribed to {provider.code}")
+                        logger.info("[BROADTAPE NEWS] Subscribed to %s", provider_code)
                         
                     except Exception as e:
-                        print(f"[BROADTAPE NEWS] Failed to subscribe to {provider.code}: {e}")
+                        logger.warning("[BROADTAPE NEWS] Failed to subscribe to %s: %s", provider_code, e)
                 
                 if not tickers:
-                    print(f"[BROADTAPE NEWS] Failed to subscribe to any providers!")
+                    logger.warning("[BROADTAPE NEWS] Failed to subscribe to any providers!")
                     return
                 
                 _broadtape_provider_tickers = [t[1] for t in tickers]
+                _broadtape_news_json = None
                 
                 # Set up event handler
-                def on_tick_news(ticker, news_tick):
-                    """Called when news headline arrives from any provider."""
-                    try:
-                        provider_code = None
-                        for pcode, pticker in tickers:
-                            if pticker == ticker:
-                                provider_code = pcode
-                                break
-                        
-                        news_item = {
-                            "timestamp": int(time.time()),
-                            "providerCode": news_tick.providerCode,
-                            "articleId": news_tick.articleId,
-                            "headline": news_tick.headline,
-                            "source": provider_code or news_tick.providerCode,
-                            "time": news_tick.time.isoformat() if news_tick.time else None
-                        }
-                        
-                        event_queue.put_nowait(news_item)
-                        print(f"[BROADTAPE NEWS] Queued headline from {provider_code}: {news_tick.headline[:60]}...")
-                        
-                    except Exception as e:
-                        print(f"[BROADTAPE NEWS] Error handling news: {e}")
-                
-                ticker_map = {ticker.contract.conId: (provider_code, ticker) for provider_code, ticker in tickers}
-                
-                def global_news_handler(ticker, news_tick):
-                    if ticker.contract.conId in ticker_map:
-                        provider_code, _ = ticker_map[ticker.contract.conId]
-                        on_tick_news(ticker, news_tick)
-                
-                tws.ib.tickNewsEvent += global_news_handler
-                print(f"[BROADTAPE NEWS] Attached global news handler for {len(tickers)} providers")
-                
-                await asyncio.sleep(1.0)
+                def on_tick_news(provider_code, news_tick):
+                    """Called when news headline arrives from any provider.
+                    
+                    Only collects the raw tick; the loop below builds the news items,
+                    reading the clock once per burst instead of once per headline.
+                    """
+                    pending.append((provider_code, news_tick))
+                    wakeup.set()
                 
-                # Process initial queued events
-                while not event_queue.empty():
-                    news_item = event_queue.get_nowait()
-                    _broadtape_news_cache.append(news_item)
-                    await ctx.session.send_resource_updated("ibkr://broadtape-news")
-                    print(f"[BROADTAPE NEWS] Initial headline: {news_item['headline'][:60]}...")
+                # Route each provider ticker's news ticks to the handler, tagged with its provider
+                for provider_code, ticker in tickers:
+                    _attach_tick_news_route(tws.ib, ticker, functools.partial(on_tick_news, provider_code))
+                logger.info("[BROADTAPE NEWS] Attached news handler for %d providers", len(tickers))
                 
                 # Enter main streaming loop
                 while True:
-                    await tws.ib.updateEvent
+                    # Sleep until a headline arrives, then take everything queued so far.
+                    # A quiet feed still wakes every _NEWS_SWEEP_INTERVAL to expire old
+                    # headlines.
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), _NEWS_SWEEP_INTERVAL)
+                    except asyncio.TimeoutError:
+                        if _evict_expired(_broadtape_news_cache, time_ns() // 1_000_000_000):
+                            _broadtape_news_json = None
+                        continue
+                    wakeup.clear()
+                    batch, pending = pending, deque()
                     
-                    while not event_queue.empty():
-                        news_item = event_queue.get_nowait()
-                        _broadtape_news_cache.append(news_item)
-                        
-                        if len(_broadtape_news_cache) > 1000:
-                            _broadtape_news_cache = _broadtape_news_cache[-500:]
-                        
+                    now = time_ns() // 1_000_000_000
+                    batch = [
+                        BroadTapeNewsItem(
+                            now,
+                            news_tick.providerCode,
+                            news_tick.articleId,
+                            news_tick.headline,
+                            provider_code or news_tick.providerCode,
+                            _news_tick_time(news_tick)
+                        )
+                        for provider_code, news_tick in batch
+                        if _first_sighting(_broadtape_seen_articles, news_tick)
+                    ]
+                    if not batch:
+                        continue  # Only re-sent headlines
+                    
+                    _broadtape_news_cache.extend(batch)
+                    _evict_expired(_broadtape_news_cache, now)
+                    _broadtape_news_json = None
+                    try:
                         await ctx.session.send_resource_updated("ibkr://broadtape-news")
-                        print(f"[BROADTAPE NEWS] New headline from {news_item['source']}: {news_item['headline'][:60]}... - notification sent")
+                    except Exception as e:
+                        logger.warning("[BROADTAPE NEWS] Failed to notify: %s", e)
+                    
+                    if logger.isEnabledFor(logging.DEBUG):
+                        for news_item in batch:
+                            logger.debug("[BROADTAPE NEWS] New headline from %s: %s... - notification sent",
+                                         news_item.source, (news_item.headline or '')[:60])
+                    await asyncio.sleep(_NEWS_NOTIFY_INTERVAL)
             
             except asyncio.CancelledError:
-                print(f"[BROADTAPE NEWS] Stream cancelled")
-                for ticker in _broadtape_provider_tickers:
-                    try:
-                        tws.ib.cancelMktData(ticker)
-                    except:
-                        pass
+                logger.info("[BROADTAPE NEWS] Stream cancelled")
             except Exception as e:
-                print(f"[BROADTAPE NEWS] Stream error: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        _broadtape_news_cache = []
+                logger.exception("[BROADTAPE NEWS] Stream error: %s", e)
+            finally:
+                # Release the provider subscriptions however the stream ended
+                _cancel_broadtape_tickers(tws.ib)
+                # Drop the routes so they do not retain the closure and its pending headlines
+                for _, ticker in tickers:
+                    _detach_tick_news_route(tws.ib, ticker)
+                pending = None
+        
+        _broadtape_news_cache.clear()
+        _broadtape_seen_articles.clear()
+        _broadtape_news_json = None
         _broadtape_news_task = asyncio.create_task(stream_to_resource())
         _broadtape_news_subscribed = True
         
-        return json.dumps({
+        return orjson.dumps({
             "status": "subscribed",
             "resource_uri": "ibkr://broadtape-news",
             "message": "BroadTape news streaming started. Headlines from all providers will be aggregated.",
             "note": "Providers will be discovered automatically. Ensure you have news subscriptions enabled in IB Client Portal."
-        })
+        }).decode()
     
     @mcp.tool()
     async def ibkr_stop_broadtape_news_resource(
@@ -712,40 +1090,33 @@ def register_news_resource(mcp: FastMCP):
         Returns:
             JSON with status
         """
-        global _broadtape_news_subscribed, _broadtape_news_task, _broadtape_provider_tickers, _broadtape_news_cache
+        global _broadtape_news_subscribed, _broadtape_news_task, _broadtape_news_json
         
         if not _broadtape_news_subscribed:
-            return json.dumps({
-                "error": "BroadTape news not streaming",
-                "subscribed": False
-            })
+            return _ERR_NO_BROADTAPE_STREAM
         
         tws = ctx.request_context.lifespan_context.tws
         
-        # Cancel background task
-        if _broadtape_news_task:
-            _broadtape_news_task.cancel()
-            try:
-                await _broadtape_news_task
-            except asyncio.CancelledError:
-                pass
+        # Cancel background task and ticker subscriptions. Cleanup runs in finally, so
+        # cancelling this call part-way still releases everything.
+        try:
+            if _broadtape_news_task:
+                await stop_stream_task(_broadtape_news_task)
+        finally:
             _broadtape_news_task = None
+            
+            # Cancel any ticker subscriptions the stream did not release itself
+            _cancel_broadtape_tickers(tws.ib)
+            
+            # Cleanup
+            _broadtape_news_subscribed = False
+            _broadtape_news_cache.clear()
+            _broadtape_seen_articles.clear()
+            _broadtape_news_json = None
         
-        # Cancel all ticker subscriptions
-        for ticker in _broadtape_provider_tickers:
-            try:
-                tws.ib.cancelMktData(ticker)
-            except:
-                pass
-        
-        # Cleanup
-        _broadtape_news_subscribed = False
-        _broadtape_provider_tickers = []
-        _broadtape_news_cache = []
-        
-        print(f"[BROADTAPE NEWS] Stopped stream")
+        logger.info("[BROADTAPE NEWS] Stopped stream")
         
-        return json.dumps({
+        return orjson.dumps({
             "status": "stopped",
             "message": "BroadTape news streaming stopped"
-        })
+        }).decode()
@@ -1,24 +1,108 @@
 """Portfolio streaming resource."""
 
 import asyncio
-import json
-from typing import Dict, Any, Set, Optional
+import functools
+import logging
+from typing import Dict, Any, List, Optional
+import orjson
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.session import ServerSession
-from ..models import AppContext
+from ..models import AppContext, PortfolioEntry
+from ._tasks import stop_stream_task, task_status
 
+logger = logging.getLogger(__name__)
 
-# Global state for portfolio resources
-_portfolio_cache: Dict[str, Dict[str, Any]] = {}
-_portfolio_resource_subscriptions: Set[str] = set()
-_portfolio_background_streams: Dict[str, asyncio.Task] = {}
+# Portfolio streaming state lives on the session's AppContext (portfolio_streams),
+# next to the TWS client the streams read from.
+
+# Updates arriving within this window (seconds) are coalesced into one notification (latest wins)
+_PORTFOLIO_NOTIFY_DEBOUNCE = 0.05
+
+# Pre-built response for reads of an account that is not streaming; only the account varies
+_ERR_NO_PORTFOLIO_DATA = (
+    '{"error":"No data for account %(account)s",'
+    '"message":"Call ibkr_start_portfolio_resource(\'%(account)s\') first to start streaming",'
+    '"subscribed":false}'
+)
+
+# Pre-serialized tool responses; the per-account ones are cached by account
+_ERR_NOT_CONNECTED = orjson.dumps({
+    "error": "TWS client not connected",
+    "message": "Call ibkr_connect first"
+}).decode()
+
+
+@functools.lru_cache(maxsize=256)
+def _already_subscribed_msg(account: str) -> str:
+    """Response for starting a stream that is already running for account."""
+    return orjson.dumps({
+        "status": "already_subscribed",
+        "resource_uri": f"ibkr://portfolio/{account}",
+        "message": f"Portfolio already streaming for {account}"
+    }).decode()
+
+
+@functools.lru_cache(maxsize=256)
+def _subscribed_msg(account: str) -> str:
+    """Response for a newly started portfolio stream for account."""
+    return orjson.dumps({
+        "status": "subscribed",
+        "resource_uri": f"ibkr://portfolio/{account}",
+        "message": f"Portfolio streaming started for {account}",
+        "account": account
+    }).decode()
+
+
+@functools.lru_cache(maxsize=256)
+def _no_active_stream_msg(account: str) -> str:
+    """Response for stopping a stream that is not running for account."""
+    return orjson.dumps({
+        "error": f"No active stream for account {account}",
+        "subscribed": False
+    }).decode()
+
+
+@functools.lru_cache(maxsize=256)
+def _stopped_msg(account: str) -> str:
+    """Response for a stopped portfolio stream for account."""
+    return orjson.dumps({
+        "status": "stopped",
+        "account": account,
+        "message": f"Portfolio streaming stopped for {account}"
+    }).decode()
+
+
+def _serialize_portfolio(account: str, data: Dict[str, Any], timestamp: float) -> str:
+    """Serialize the portfolio resource payload for an account."""
+    return orjson.dumps({
+        "account": account,
+        "subscribed": True,
+        "data": data,
+        "last_update": timestamp
+    }).decode()
+
+
+def list_portfolio_streams(app_ctx: AppContext) -> List[Dict[str, Any]]:
+    """Describe the active portfolio streams of a session."""
+    return [
+        {
+            "account": account,
+            "resource_uri": f"ibkr://portfolio/{account}",
+            "last_update": entry.timestamp,
+            "status": task_status(entry.task)
+        }
+        for account, entry in list(app_ctx.portfolio_streams.items())
+    ]
 
 
 def register_portfolio_resource(mcp: FastMCP):
     """Register portfolio streaming resource."""
     
     @mcp.resource("ibkr://portfolio/{account}")
-    async def get_portfolio_resource(account: str) -> str:
+    async def get_portfolio_resource(
+        account: str,
+        ctx: Context[ServerSession, AppContext]
+    ) -> str:
         """Get current portfolio/account updates for an account.
         
         This resource provides real-time portfolio and account value updates.
@@ -35,20 +119,14 @@ def register_portfolio_resource(mcp: FastMCP):
         Returns:
             JSON string with current portfolio/account data
         """
-        if account not in _portfolio_cache:
-            return json.dumps({
-                "error": f"No data for account {account}",
-                "message": f"Call ibkr_start_portfolio_resource('{account}') first to start streaming",
-                "subscribed": False
-            })
-        
-        data = _portfolio_cache[account]
-        return json.dumps({
-            "account": account,
-            "subscribed": True,
-            "data": data.get("data", {}),
-            "last_update": data.get("timestamp", 0)
-        })
+        entry = ctx.request_context.lifespan_context.portfolio_streams.get(account)
+        
+        if entry is None:
+            # Escape the account for embedding inside the template's JSON strings
+            return _ERR_NO_PORTFOLIO_DATA % {"account": orjson.dumps(account).decode()[1:-1]}
+        
+        # Serialized once per update by the streaming task, not on every read
+        return entry.serialized
     
     @mcp.tool()
     async def ibkr_start_portfolio_resource(
@@ -66,74 +144,104 @@ def register_portfolio_resource(mcp: FastMCP):
         Returns:
             JSON with resource URI and subscription status
         """
-        print(f"[PORTFOLIO TOOL] ibkr_start_portfolio_resource called for account: {account}")
+        logger.info("[PORTFOLIO TOOL] ibkr_start_portfolio_resource called for account: %s", account)
         
-        tws = ctx.request_context.lifespan_context.tws
+        app_ctx = ctx.request_context.lifespan_context
+        tws = app_ctx.tws
         
         if not tws or not tws.is_connected():
-            print(f"[PORTFOLIO TOOL] TWS not connected")
-            return json.dumps({
-                "error": "TWS client not connected",
-                "message": "Call ibkr_connect first"
-            })
-        
-        if account in _portfolio_resource_subscriptions:
-            print(f"[PORTFOLIO TOOL] Already subscribed to {account}")
-            return json.dumps({
-                "status": "already_subscribed",
-                "resource_uri": f"ibkr://portfolio/{account}",
-                "message": f"Portfolio already streaming for {account}"
-            })
-        
-        print(f"[PORTFOLIO TOOL] Initializing cache and starting stream for {account}")
+            logger.warning("[PORTFOLIO TOOL] TWS not connected")
+            return _ERR_NOT_CONNECTED
+        
+        if account in app_ctx.portfolio_streams:
+            logger.info("[PORTFOLIO TOOL] Already subscribed to %s", account)
+            return _already_subscribed_msg(account)
+        
+        logger.info("[PORTFOLIO TOOL] Initializing cache and starting stream for %s", account)
         
         # Initialize cache
-        _portfolio_cache[account] = {
-            "data": {},
-            "timestamp": 0
-        }
+        entry = PortfolioEntry(
+            data={},
+            timestamp=0.0,
+            serialized=_serialize_portfolio(account, {}, 0)
+        )
         
         # Start background streaming task
         async def stream_to_resource():
             """Background task that updates the portfolio resource."""
-            print(f"[PORTFOLIO RESOURCE] Starting portfolio stream for {account}")
+            logger.info("[PORTFOLIO RESOURCE] Starting portfolio stream for %s", account)
             
-            try:
+            resource_uri = f"ibkr://portfolio/{account}"
+            now = asyncio.get_running_loop().time
+            notify = ctx.session.send_resource_updated
+            
+            # Latest update not yet published, and a flag telling the sender there is one
+            pending: Optional[Dict[str, Any]] = None
+            dirty = asyncio.Event()
+            
+            async def collect_updates():
+                """Keep only the latest account update; the loop below publishes it."""
+                nonlocal pending
                 async for data in tws.stream_account_updates(account):
                     # Log all data received, even empty ones
-                    print(f"[PORTFOLIO RESOURCE] Received data for {account}: {data}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[PORTFOLIO RESOURCE] Received data for %s: %s", account, data)
                     
                     if data:
+                        pending = data
+                        dirty.set()
+            
+            collector = asyncio.create_task(collect_updates())
+            # Wake the sender when the stream ends so it can flush and exit
+            collector.add_done_callback(lambda _: dirty.set())
+            
+            try:
+                while True:
+                    # Wait for an update, then let the rest of the burst arrive before publishing
+                    await dirty.wait()
+                    await asyncio.sleep(_PORTFOLIO_NOTIFY_DEBOUNCE)
+                    dirty.clear()
+                    
+                    if pending is not None:
+                        data, pending = pending, None
+                        
                         # Update cache
-                        _portfolio_cache[account]["data"] = data
-                        _portfolio_cache[account]["timestamp"] = asyncio.get_event_loop().time()
+                        entry.data = data
+                        entry.timestamp = now()
+                        entry.serialized = _serialize_portfolio(account, data, entry.timestamp)
                         
-                        # Notify all subscribed clients
-                        await ctx.session.send_resource_updated(f"ibkr://portfolio/{account}")
+                        # Notify all subscribed clients; a failed notification must not end the stream
+                        try:
+                            await notify(resource_uri)
+                        except Exception as e:
+                            logger.warning("[PORTFOLIO RESOURCE] Failed to notify %s: %s", account, e)
                         
-                        print(f"[PORTFOLIO RESOURCE] Updated {account}: {data.get('type', 'unknown')} - notification sent")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("[PORTFOLIO RESOURCE] Updated %s: %s - notification sent",
+                                         account, data.get('type', 'unknown'))
+                    
+                    if collector.done():
+                        collector.result()  # Re-raise any stream error
+                        break
             except asyncio.CancelledError:
-                print(f"[PORTFOLIO RESOURCE] Stream cancelled for {account}")
+                logger.info("[PORTFOLIO RESOURCE] Stream cancelled for %s", account)
             except Exception as e:
-                print(f"[PORTFOLIO RESOURCE] Stream error for {account}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("[PORTFOLIO RESOURCE] Stream error for %s: %s", account, e)
+            finally:
+                collector.cancel()
         
-        task = asyncio.create_task(stream_to_resource())
-        _portfolio_background_streams[account] = task
-        _portfolio_resource_subscriptions.add(account)
+        entry.task = asyncio.create_task(stream_to_resource())
+        app_ctx.portfolio_streams[account] = entry
         
-        print(f"[PORTFOLIO TOOL] Task created and subscribed for {account}")
+        logger.info("[PORTFOLIO TOOL] Task created and subscribed for %s", account)
         
-        return json.dumps({
-            "status": "subscribed",
-            "resource_uri": f"ibkr://portfolio/{account}",
-            "message": f"Portfolio streaming started for {account}",
-            "account": account
-        })
+        return _subscribed_msg(account)
     
     @mcp.tool()
-    async def ibkr_stop_portfolio_resource(account: str) -> str:
+    async def ibkr_stop_portfolio_resource(
+        ctx: Context[ServerSession, AppContext],
+        account: str
+    ) -> str:
         """Stop streaming portfolio updates to a resource.
         
         Args:
@@ -142,29 +250,19 @@ def register_portfolio_resource(mcp: FastMCP):
         Returns:
             JSON with status
         """
-        if account not in _portfolio_background_streams:
-            return json.dumps({
-                "error": f"No active stream for account {account}",
-                "subscribed": False
-            })
-        
-        # Cancel background task
-        task = _portfolio_background_streams[account]
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
+        app_ctx = ctx.request_context.lifespan_context
         
-        # Cleanup
-        del _portfolio_background_streams[account]
-        _portfolio_resource_subscriptions.remove(account)
-        del _portfolio_cache[account]
+        entry = app_ctx.portfolio_streams.get(account)
+        if entry is None:
+            return _no_active_stream_msg(account)
         
-        print(f"[PORTFOLIO RESOURCE] Stopped stream for {account}")
+        # Cancel background task. Cleanup runs in finally, so cancelling this call
+        # part-way still releases the account's stream state.
+        try:
+            await stop_stream_task(entry.task)
+        finally:
+            app_ctx.portfolio_streams.pop(account, None)
         
-        return json.dumps({
-            "status": "stopped",
-            "account": account,
-            "message": f"Portfolio streaming stopped for {account}"
-        })
+        logger.info("[PORTFOLIO RESOURCE] Stopped stream for %s", account)
+        
+        return _stopped_msg(account)
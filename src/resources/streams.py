@@ -0,0 +1,37 @@
+"""Overview of active resource streams."""
+
+import orjson
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.session import ServerSession
+from ..models import AppContext
+from .market_data import list_market_data_streams
+from .portfolio import list_portfolio_streams
+from .news import list_news_streams
+
+
+def register_streams_resource(mcp: FastMCP):
+    """Register the active resource streams overview tool."""
+    
+    @mcp.tool()
+    async def ibkr_list_active_resource_streams(
+        ctx: Context[ServerSession, AppContext]
+    ) -> str:
+        """List all active resource streams.
+        
+        Reports every running market data, portfolio, news bulletin, tick news and
+        BroadTape news stream with its resource URI and task status.
+        
+        Returns:
+            JSON with a count and list of streams per resource type
+        """
+        app_ctx = ctx.request_context.lifespan_context
+        groups = {
+            "market_data": list_market_data_streams(),
+            "portfolio": list_portfolio_streams(app_ctx),
+            **list_news_streams(app_ctx)
+        }
+        
+        return orjson.dumps({
+            name: {"count": len(streams), "streams": streams}
+            for name, streams in groups.items()
+        }).decode()
@@ -1,7 +1,7 @@
 """Streamlined MCP server entry point with modular tool structure."""
 
 import os
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import AsyncIterator
 from mcp.server.fastmcp import FastMCP
 from starlette.routing import Route
@@ -9,6 +9,8 @@ from starlette.middleware.cors import CORSMiddleware
 
 from .tws_client import TWSClient
 from .models import AppContext
+from .resources.market_data import cancel_market_data_streams
+from .resources.news import remove_tick_news_router
 from .tools import (
     register_connection_tools,
     register_contract_tools,
@@ -23,22 +25,63 @@ from .tools import (
 from .resources import (
     register_market_data_resource,
     register_portfolio_resource,
-    register_news_resource
+    register_news_resource,
+    register_streams_resource
 )
 from .prompts import register_all_prompts
 
 
+def _disconnect_tws(tws: TWSClient) -> None:
+    """Disconnect the TWS client if it is connected.
+    
+    Called on the event loop thread: ib_async is not thread-safe, and disconnecting
+    only closes the asyncio transport, which does not block. Being synchronous, it
+    cannot be interrupted by cancellation of the lifespan.
+    """
+    if tws.is_connected():
+        tws.disconnect()
+
+
+def _cancel_portfolio_streams(app_ctx: AppContext) -> None:
+    """Cancel any portfolio streams still running for a context."""
+    for entry in app_ctx.portfolio_streams.values():
+        if entry.task:
+            entry.task.cancel()
+
+
+def _cancel_tick_news_streams(app_ctx: AppContext) -> None:
+    """Cancel any tick news streams and their dispatcher still running for a context.
+    
+    Also removes the news tick router from the session's IB connection, as streams
+    cancelled before they started never detach their own routes.
+    """
+    tick_news = app_ctx.tick_news
+    for task in tick_news.tasks.values():
+        task.cancel()
+    if tick_news.dispatch_task:
+        tick_news.dispatch_task.cancel()
+    remove_tick_news_router(app_ctx.tws.ib)
+
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
-    """Manage TWS client lifecycle."""
-    tws = TWSClient()
-    try:
+    """Manage TWS client lifecycle.
+    
+    FastMCP enters this lifespan once per MCP session. Cleanup steps are registered on
+    one exit stack as soon as their resource exists, so they run in reverse order and
+    the TWS client is still disconnected if an earlier step fails.
+    """
+    async with AsyncExitStack() as stack:
         # TWS client is initialized but not connected here. Connection is done via the ibkr_connect tool.
-        yield AppContext(tws=tws)
-    finally:
-        # Ensure TWS client is disconnected on shutdown
-        if tws.is_connected():
-            tws.disconnect()
+        tws = TWSClient()
+        stack.callback(_disconnect_tws, tws)
+        stack.callback(cancel_market_data_streams, tws)
+        
+        app_ctx = AppContext(tws=tws)
+        stack.callback(_cancel_portfolio_streams, app_ctx)
+        stack.callback(_cancel_tick_news_streams, app_ctx)
+        
+        yield app_ctx
 
 
 # Create MCP server with lifespan
@@ -63,6 +106,7 @@ register_advanced_tools(mcp)
 register_market_data_resource(mcp)
 register_portfolio_resource(mcp)
 register_news_resource(mcp)
+register_streams_resource(mcp)
 
 # Register all prompts
 register_all_prompts(mcp)
@@ -89,7 +133,7 @@ mcp_base_app.routes.extend([
 async def combined_lifespan(app_instance):
     """Wrap the Starlette app to initialize MCP session manager."""
     # Get the MCP session manager and run it (initializes task group)
-    # The TWS client is already managed by app_lifespan above
+    # TWS clients are per MCP session, managed by app_lifespan when each session runs
     async with mcp.session_manager.run():
         yield
 
@@ -103,26 +147,9 @@ app = CORSMiddleware(
     allow_origins=["*"],  # Allow all origins for browser-based clients
     allow_credentials=True,  # Allow credentials (cookies, authorization headers)
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "HEAD"],
-    allow_headers=[
-        "*",
-        "Content-Type",
-        "Authorization",
-        "X-Requested-With",
-        "Accept",
-        "Accept-Encoding",
-        "Accept-Language",
-        "Cache-Control",
-        "Connection",
-        "Host",
-        "Origin",
-        "Referer",
-        "Sec-Fetch-Dest",
-        "Sec-Fetch-Mode",
-        "Sec-Fetch-Site",
-        "User-Agent",
-        "Mcp-Session-Id",
-        "Mcp-Initialize-Request",
-    ],
+    # "*" mirrors whatever headers a preflight requests (e.g. Mcp-Session-Id), so listing
+    # individual headers next to it has no effect
+    allow_headers=["*"],
     expose_headers=[
         "Mcp-Session-Id",
         "Access-Control-Allow-Origin",
@@ -140,6 +167,9 @@ if __name__ == "__main__":
     host = os.getenv("SERVER_HOST", "0.0.0.0")
     port = int(os.getenv("SERVER_PORT", 8000))
     
+    # uvicorn[standard] installs uvloop and httptools, which uvicorn's default "auto"
+    # loop and http settings already select. Run a single worker: MCP sessions and
+    # their TWS clients live in process memory, so requests cannot be spread over workers.
     uvicorn.run(
         app,
         host=host,
@@ -1,12 +1,266 @@
 """WebSocket endpoint for real-time market data streaming."""
 
 import asyncio
-from typing import Dict, Any
+import functools
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict
+import orjson
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from ..models import ContractRequest
 from ..tws_client import TWSClient
-from .websocket_manager import StreamingManager
+from .websocket_manager import (
+    DropOldestQueue, StreamingManager, receive_message, report_dropped, send_message, send_pong
+)
+
+# Ticks queued within this window (seconds) are sent to the client as one batch frame
+_BATCH_WINDOW = 0.02
+_BATCH_MAX_ITEMS = 64
+
+# Ticks waiting for a slow client beyond this are dropped, oldest first
+_SEND_QUEUE_MAXSIZE = 1024
+
+# A client silent for this long (seconds) is pinged; after this many unanswered pings it is dropped
+_KEEPALIVE_TIMEOUT = 30
+_KEEPALIVE_MAX_MISSED = 2
+
+# Fixed messages, serialized once
+_CONNECTED_MESSAGE = orjson.dumps({
+    "type": "connected",
+    "stream": "market_data",
+    "message": "Connected to market data stream. Send {\"action\": \"subscribe\", \"symbol\": \"AAPL\"} to start."
+}).decode()
+_PING_MESSAGE = orjson.dumps({"type": "ping"}).decode()
+
+
+@functools.lru_cache(maxsize=1024)
+def _contract_for(symbol: str, sec_type: str, exchange: str, currency: str) -> ContractRequest:
+    """Return the validated ContractRequest for a contract, shared by every client subscribing to it."""
+    return ContractRequest(symbol=symbol, secType=sec_type, exchange=exchange, currency=currency)
+
+
+async def _write_batches(websocket: WebSocket, send_queue: DropOldestQueue):
+    """Send queued market data messages to the client, one batch frame per burst.
+    
+    Waits for a message, lets _BATCH_WINDOW pass so ticks arriving meanwhile are
+    included, then sends up to _BATCH_MAX_ITEMS of them together. If the client
+    fell far enough behind for ticks to be dropped, a lag frame reports how many.
+    The batch list and frame dict are reused across bursts; send_message encodes
+    the frame before its first await, so clearing the list afterwards is safe.
+    """
+    batch = []
+    frame = {"type": "batch", "items": batch}
+    while True:
+        batch.append(await send_queue.get())
+        await asyncio.sleep(_BATCH_WINDOW)
+        while len(batch) < _BATCH_MAX_ITEMS and not send_queue.empty():
+            batch.append(send_queue.get_nowait())
+        await report_dropped(websocket, send_queue)
+        try:
+            await send_message(websocket, frame)
+        finally:
+            batch.clear()
+
+
+async def _stream_one(websocket: WebSocket, manager: StreamingManager, tws: TWSClient, symbol: str,
+                      req: ContractRequest, send_queue: DropOldestQueue):
+    """Background task that queues market data for one subscribed symbol.
+    
+    Takes its arguments explicitly: a nested function would see the endpoint's
+    symbol variable, which the next subscribe or unsubscribe command rebinds.
+    Ticks come from the manager's shared stream for the contract, so clients
+    subscribed to the same contract use a single TWS subscription.
+    """
+    monotonic = asyncio.get_running_loop().time
+    queue = manager.subscribe_market_data(tws, req)
+    try:
+        while True:
+            market_data = await queue.get()
+            if not isinstance(market_data, dict):
+                if market_data is not None:
+                    raise market_data
+                break
+            
+            send_queue.put_latest({
+                "type": "market_data",
+                "symbol": symbol,
+                "timestamp": monotonic(),
+                "data": market_data
+            })
+    except asyncio.CancelledError:
+        # Clean cancellation
+        pass
+    except Exception as e:
+        await send_message(websocket, {
+            "type": "error",
+            "symbol": symbol,
+            "error": f"Streaming error: {str(e)}"
+        })
+    finally:
+        manager.unsubscribe_market_data(req, queue)
+
+
+def _forget_subscription(active_subscriptions: Dict[str, asyncio.Task], symbol: str, task: asyncio.Task):
+    """Drop a subscription whose streaming task has finished, unless it was already replaced."""
+    if active_subscriptions.get(symbol) is task:
+        del active_subscriptions[symbol]
+
+
+@dataclass(slots=True)
+class _Connection:
+    """State of one market data WebSocket connection, shared by the action handlers."""
+    websocket: WebSocket
+    tws: TWSClient
+    manager: StreamingManager
+    send_queue: DropOldestQueue  # Ticks waiting for the batch writer
+    monotonic: Callable[[], float]  # The event loop's clock, bound once
+    # Active streaming tasks per symbol
+    active_subscriptions: Dict[str, asyncio.Task] = field(default_factory=dict)
+
+
+def _start_subscription(conn: _Connection, symbol: str, contract: Dict[str, Any]):
+    """Start streaming symbol to the client in a background task and track the task."""
+    # Contract request, reused across clients subscribing to the same contract
+    req = _contract_for(
+        symbol,
+        contract.get("secType", "STK"),
+        contract.get("exchange", "SMART"),
+        contract.get("currency", "USD")
+    )
+    
+    # Drop the task's entry if it ends on its own
+    task = asyncio.create_task(_stream_one(conn.websocket, conn.manager, conn.tws, symbol, req, conn.send_queue))
+    conn.active_subscriptions[symbol] = task
+    task.add_done_callback(functools.partial(_forget_subscription, conn.active_subscriptions, symbol))
+
+
+async def _subscribe(conn: _Connection, data: Dict[str, Any]):
+    """Handle {"action": "subscribe", "symbol": ..., ...}."""
+    symbol = data.get("symbol")
+    
+    # Check if already subscribed
+    if symbol in conn.active_subscriptions:
+        await send_message(conn.websocket, {
+            "type": "warning",
+            "symbol": symbol,
+            "message": f"Already subscribed to {symbol}"
+        })
+        return
+    
+    # Check TWS connection
+    if not conn.tws or not conn.tws.is_connected():
+        await send_message(conn.websocket, {
+            "type": "error",
+            "error": "Not connected to TWS. Call ibkr_connect first."
+        })
+        return
+    
+    # Start streaming in background task
+    _start_subscription(conn, symbol, data)
+    
+    await send_message(conn.websocket, {
+        "type": "subscribed",
+        "symbol": symbol,
+        "message": f"Subscribed to {symbol} market data"
+    })
+
+
+async def _subscribe_many(conn: _Connection, data: Dict[str, Any]):
+    """Handle {"action": "subscribe_many", "contracts": [...]}."""
+    # Check TWS connection
+    if not conn.tws or not conn.tws.is_connected():
+        await send_message(conn.websocket, {
+            "type": "error",
+            "error": "Not connected to TWS. Call ibkr_connect first."
+        })
+        return
+    
+    contracts = data.get("contracts", [])
+    if not isinstance(contracts, list):
+        await send_message(conn.websocket, {
+            "type": "error",
+            "error": "contracts must be a list of contract objects"
+        })
+        return
+    
+    # Subscribe to every contract not already streaming, then acknowledge once.
+    # A malformed entry is reported by its index instead of failing the whole batch.
+    subscribed = []
+    skipped = []
+    invalid = []
+    for index, contract in enumerate(contracts):
+        symbol = contract.get("symbol") if isinstance(contract, dict) else None
+        if not isinstance(symbol, str) or not symbol:
+            invalid.append({"index": index, "error": "Contract must be an object with a symbol"})
+            continue
+        if symbol in conn.active_subscriptions:
+            skipped.append(symbol)
+            continue
+        try:
+            _start_subscription(conn, symbol, contract)
+        except (TypeError, ValueError) as e:
+            # Unhashable or wrongly typed contract fields, rejected before any task starts
+            invalid.append({"index": index, "symbol": symbol, "error": f"Invalid contract: {e}"})
+            continue
+        subscribed.append(symbol)
+    
+    await send_message(conn.websocket, {
+        "type": "subscribed_batch",
+        "symbols": subscribed,
+        "skipped": skipped,
+        "invalid": invalid
+    })
+
+
+async def _unsubscribe(conn: _Connection, data: Dict[str, Any]):
+    """Handle {"action": "unsubscribe", "symbol": ...}."""
+    symbol = data.get("symbol")
+    
+    if symbol in conn.active_subscriptions:
+        # Cancel the streaming task
+        task = conn.active_subscriptions.pop(symbol)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        
+        await send_message(conn.websocket, {
+            "type": "unsubscribed",
+            "symbol": symbol,
+            "message": f"Unsubscribed from {symbol}"
+        })
+    else:
+        await send_message(conn.websocket, {
+            "type": "warning",
+            "symbol": symbol,
+            "message": f"Not subscribed to {symbol}"
+        })
+
+
+async def _list_subscriptions(conn: _Connection, data: Dict[str, Any]):
+    """Handle {"action": "list"}."""
+    await send_message(conn.websocket, {
+        "type": "subscriptions",
+        "symbols": list(conn.active_subscriptions.keys()),
+        "count": len(conn.active_subscriptions)
+    })
+
+
+async def _ping(conn: _Connection, data: Dict[str, Any]):
+    """Handle {"action": "ping"}."""
+    await send_pong(conn.websocket, conn.monotonic())
+
+
+# Client actions and their handlers, looked up once per inbound message
+_ACTION_HANDLERS: Dict[str, Callable[[_Connection, Dict[str, Any]], Awaitable[None]]] = {
+    "subscribe": _subscribe,
+    "subscribe_many": _subscribe_many,
+    "unsubscribe": _unsubscribe,
+    "list": _list_subscriptions,
+    "ping": _ping,
+}
+_VALID_ACTIONS = list(_ACTION_HANDLERS)
 
 
 async def market_data_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingManager):
@@ -14,9 +268,17 @@ async def market_data_stream(websocket: WebSocket, tws: TWSClient, manager: Stre
     
     Protocol:
     - Client → Server: {"action": "subscribe", "symbol": "AAPL", "secType": "STK", ...}
-    - Server → Client: {"type": "market_data", "symbol": "AAPL", "data": {...}}
+    - Client → Server: {"action": "subscribe_many", "contracts": [{"symbol": "AAPL", ...}, ...]}
+      → Server responds once: {"type": "subscribed_batch", "symbols": [...], "skipped": [...],
+        "invalid": [{"index": 2, "error": "..."}, ...]}
+    - Server → Client: {"type": "batch", "items": [{"type": "market_data", "symbol": "AAPL", "data": {...}}, ...]}
+    - Server → Client: {"type": "lag", "dropped": 12} when ticks were dropped for a slow client
     - Client → Server: {"action": "unsubscribe", "symbol": "AAPL"}
     - Client → Server: {"action": "ping"} → Server responds: {"type": "pong"}
+    - Server → Client: {"type": "ping"} after _KEEPALIVE_TIMEOUT (30s) without a client
+      message. Only client messages count, so a client that just listens must answer
+      with {"action": "ping"}; after _KEEPALIVE_MAX_MISSED (2) silent intervals, about
+      60s, the connection is closed
     
     Example:
         # JavaScript client
@@ -34,139 +296,58 @@ async def market_data_stream(websocket: WebSocket, tws: TWSClient, manager: Stre
         
         ws.onmessage = (event) => {
             const data = JSON.parse(event.data);
-            if (data.type === 'market_data') {
-                console.log(`${data.symbol}: ${data.data.last}`);
+            if (data.type === 'batch') {
+                for (const tick of data.items) {
+                    console.log(`${tick.symbol}: ${tick.data.last}`);
+                }
+            } else if (data.type === 'lag') {
+                console.warn(`${data.dropped} ticks dropped`);
+            } else if (data.type === 'ping') {
+                ws.send(JSON.stringify({action: 'ping'}));
             }
         };
     """
     await manager.connect(websocket, "market_data")
     
+    # Ticks from all subscriptions go through one writer, which sends them in batches
+    conn = _Connection(
+        websocket,
+        tws,
+        manager,
+        DropOldestQueue(_SEND_QUEUE_MAXSIZE),
+        asyncio.get_running_loop().time
+    )
+    writer = asyncio.create_task(_write_batches(websocket, conn.send_queue))
+    
     try:
         # Send connection confirmation
-        await websocket.send_json({
-            "type": "connected",
-            "stream": "market_data",
-            "message": "Connected to market data stream. Send {\"action\": \"subscribe\", \"symbol\": \"AAPL\"} to start."
-        })
-        
-        # Track active streaming tasks per symbol
-        active_subscriptions: Dict[str, asyncio.Task] = {}
+        await websocket.send_text(_CONNECTED_MESSAGE)
         
+        missed = 0
         while True:
-            # Receive subscription commands from client
-            data = await websocket.receive_json()
+            # Receive subscription commands from client. A half-open connection never
+            # raises WebSocketDisconnect, so ping a silent client and give up on it
+            # when it stays silent.
+            try:
+                data = await asyncio.wait_for(receive_message(websocket), _KEEPALIVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                missed += 1
+                if missed >= _KEEPALIVE_MAX_MISSED:
+                    break
+                await websocket.send_text(_PING_MESSAGE)
+                continue
+            missed = 0
             action = data.get("action")
             
-            if action == "subscribe":
-                symbol = data.get("symbol")
-                sec_type = data.get("secType", "STK")
-                exchange = data.get("exchange", "SMART")
-                currency = data.get("currency", "USD")
-                
-                # Check if already subscribed
-                if symbol in active_subscriptions:
-                    await websocket.send_json({
-                        "type": "warning",
-                        "symbol": symbol,
-                        "message": f"Already subscribed to {symbol}"
-                    })
-                    continue
-                
-                # Check TWS connection
-                if not tws or not tws.is_connected():
-                    await websocket.send_json({
-                        "type": "error",
-                        "error": "Not connected to TWS. Call ibkr_connect first."
-                    })
-                    continue
-                
-                # Create contract request
-                req = ContractRequest(
-                    symbol=symbol,
-                    secType=sec_type,
-                    exchange=exchange,
-                    currency=currency
-                )
-                
-                # Start streaming in background task
-                async def stream_data():
-                    """Background task to stream market data for this symbol."""
-                    try:
-                        async for market_data in tws.stream_market_data(req):
-                            if not market_data:
-                                continue
-                            
-                            await websocket.send_json({
-                                "type": "market_data",
-                                "symbol": symbol,
-                                "timestamp": asyncio.get_event_loop().time(),
-                                "data": market_data
-                            })
-                    except asyncio.CancelledError:
-                        # Clean cancellation
-                        pass
-                    except Exception as e:
-                        await websocket.send_json({
-                            "type": "error",
-                            "symbol": symbol,
-                            "error": f"Streaming error: {str(e)}"
-                        })
-                
-                # Create and store task
-                task = asyncio.create_task(stream_data())
-                active_subscriptions[symbol] = task
-                
-                await websocket.send_json({
-                    "type": "subscribed",
-                    "symbol": symbol,
-                    "message": f"Subscribed to {symbol} market data"
-                })
-            
-            elif action == "unsubscribe":
-                symbol = data.get("symbol")
-                
-                if symbol in active_subscriptions:
-                    # Cancel the streaming task
-                    active_subscriptions[symbol].cancel()
-                    try:
-                        await active_subscriptions[symbol]
-                    except asyncio.CancelledError:
-                        pass
-                    
-                    del active_subscriptions[symbol]
-                    
-                    await websocket.send_json({
-                        "type": "unsubscribed",
-                        "symbol": symbol,
-                        "message": f"Unsubscribed from {symbol}"
-                    })
-                else:
-                    await websocket.send_json({
-                        "type": "warning",
-                        "symbol": symbol,
-                        "message": f"Not subscribed to {symbol}"
-                    })
-            
-            elif action == "list":
-                # List active subscriptions
-                await websocket.send_json({
-                    "type": "subscriptions",
-                    "symbols": list(active_subscriptions.keys()),
-                    "count": len(active_subscriptions)
-                })
-            
-            elif action == "ping":
-                await websocket.send_json({
-                    "type": "pong",
-                    "timestamp": asyncio.get_event_loop().time()
-                })
-            
-            else:
-                await websocket.send_json({
+            handler = _ACTION_HANDLERS.get(action)
+            if handler is None:
+                await send_message(websocket, {
                     "type": "error",
                     "error": f"Unknown action: {action}",
-                    "valid_actions": ["subscribe", "unsubscribe", "list", "ping"]
+                    "valid_actions": _VALID_ACTIONS
                 })
+                continue
+            await handler(conn, data)
     
     except WebSocketDisconnect:
         # Client disconnected
@@ -174,20 +355,20 @@ async def market_data_stream(websocket: WebSocket, tws: TWSClient, manager: Stre
     except Exception as e:
         # Unexpected error
         try:
-            await websocket.send_json({
+            await send_message(websocket, {
                 "type": "error",
                 "error": f"Server error: {str(e)}"
             })
         except:
             pass
     finally:
-        # Cleanup: cancel all active subscriptions
-        for task in active_subscriptions.values():
+        # Cleanup: cancel all active subscriptions and the writer together, then wait
+        # for them at once rather than one after another
+        tasks = [*conn.active_subscriptions.values(), writer]
+        for task in tasks:
             task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
-        
-        # Disconnect from manager
-        await manager.disconnect(websocket, "market_data")
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # Disconnect from manager, even if this endpoint is itself being cancelled
+            await manager.disconnect(websocket, "market_data")
@@ -1,10 +1,23 @@
 """WebSocket endpoint for real-time news bulletins streaming."""
 
 import asyncio
+import orjson
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from ..tws_client import TWSClient
-from .websocket_manager import StreamingManager
+from .websocket_manager import (
+    DropOldestQueue, StreamingManager, receive_message, send_message, send_pong, write_messages
+)
+
+# Bulletins waiting for a slow client beyond this are dropped, oldest first
+_SEND_QUEUE_MAXSIZE = 32
+
+# Connection confirmation, serialized once
+_CONNECTED_MESSAGE = orjson.dumps({
+    "type": "connected",
+    "stream": "news",
+    "message": "Connected to news stream. Send {\"action\": \"subscribe\", \"allMessages\": true} to start."
+}).decode()
 
 
 async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingManager):
@@ -42,23 +55,20 @@ async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingMa
         };
     """
     await manager.connect(websocket, "news")
+    monotonic = asyncio.get_running_loop().time
     
     try:
-        await websocket.send_json({
-            "type": "connected",
-            "stream": "news",
-            "message": "Connected to news stream. Send {\"action\": \"subscribe\", \"allMessages\": true} to start."
-        })
+        await websocket.send_text(_CONNECTED_MESSAGE)
         
         subscription_task = None
         
         while True:
-            data = await websocket.receive_json()
+            data = await receive_message(websocket)
             action = data.get("action")
             
             if action == "subscribe":
                 if subscription_task:
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "warning",
                         "message": "Already subscribed to news bulletins"
                     })
@@ -66,7 +76,7 @@ async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingMa
                 
                 # Check TWS connection
                 if not tws or not tws.is_connected():
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "error",
                         "error": "Not connected to TWS. Call ibkr_connect first."
                     })
@@ -76,31 +86,30 @@ async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingMa
                 
                 # Start streaming in background task
                 async def stream_news():
-                    """Background task to stream news bulletins."""
+                    """Background task to stream news bulletins as IB pushes them."""
+                    send_queue = DropOldestQueue(_SEND_QUEUE_MAXSIZE)
+                    
+                    def on_bulletin(bulletin):
+                        """Queue each bulletin for the writer; never waits on the client."""
+                        send_queue.put_latest({
+                            "type": "news",
+                            "timestamp": monotonic(),
+                            "data": {
+                                "msgId": bulletin.msgId,
+                                "msgType": bulletin.msgType,
+                                "message": bulletin.message,
+                                "origin": bulletin.origExchange
+                            }
+                        })
+                    
+                    # Attach before subscribing so no bulletin is missed
+                    tws.ib.newsBulletinEvent += on_bulletin
                     try:
                         # Subscribe to news bulletins
                         await tws.subscribe_news_bulletins(all_messages)
                         
-                        # Monitor for new bulletins
-                        while True:
-                            # Check for new bulletins every second
-                            await asyncio.sleep(1.0)
-                            
-                            if hasattr(tws.ib, 'newsBulletins') and tws.ib.newsBulletins():
-                                for bulletin in tws.ib.newsBulletins():
-                                    await websocket.send_json({
-                                        "type": "news",
-                                        "timestamp": asyncio.get_event_loop().time(),
-                                        "data": {
-                                            "msgId": bulletin.msgId,
-                                            "msgType": bulletin.msgType,
-                                            "message": bulletin.message,
-                                            "origin": bulletin.origin
-                                        }
-                                    })
-                                
-                                # Clear processed bulletins
-                                tws.ib.newsBulletins().clear()
+                        # Sleep until a bulletin arrives rather than polling newsBulletins()
+                        await write_messages(websocket, send_queue)
                     
                     except asyncio.CancelledError:
                         # Unsubscribe from news bulletins
@@ -110,15 +119,18 @@ async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingMa
                         except:
                             pass
                     except Exception as e:
-                        await websocket.send_json({
+                        await send_message(websocket, {
                             "type": "error",
                             "error": f"Streaming error: {str(e)}"
                         })
+                    finally:
+                        # Detach the handler so ib_async does not retain the queue
+                        tws.ib.newsBulletinEvent -= on_bulletin
                 
                 # Create and store task
                 subscription_task = asyncio.create_task(stream_news())
                 
-                await websocket.send_json({
+                await send_message(websocket, {
                     "type": "subscribed",
                     "allMessages": all_messages,
                     "message": "Subscribed to news bulletins. Note: Bulletins are typically infrequent."
@@ -134,24 +146,21 @@ async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingMa
                     
                     subscription_task = None
                     
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "unsubscribed",
                         "message": "Unsubscribed from news bulletins"
                     })
                 else:
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "warning",
                         "message": "Not subscribed to news bulletins"
                     })
             
             elif action == "ping":
-                await websocket.send_json({
-                    "type": "pong",
-                    "timestamp": asyncio.get_event_loop().time()
-                })
+                await send_pong(websocket, monotonic())
             
             else:
-                await websocket.send_json({
+                await send_message(websocket, {
                     "type": "error",
                     "error": f"Unknown action: {action}",
                     "valid_actions": ["subscribe", "unsubscribe", "ping"]
@@ -161,7 +170,7 @@ async def news_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingMa
         pass
     except Exception as e:
         try:
-            await websocket.send_json({
+            await send_message(websocket, {
                 "type": "error",
                 "error": f"Server error: {str(e)}"
             })
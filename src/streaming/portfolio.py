@@ -2,10 +2,23 @@
 
 import asyncio
 from typing import Dict
+import orjson
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
 from ..tws_client import TWSClient
-from .websocket_manager import StreamingManager
+from .websocket_manager import (
+    DropOldestQueue, StreamingManager, receive_message, send_message, send_pong, write_messages
+)
+
+# Updates waiting for a slow client beyond this are dropped, oldest first
+_SEND_QUEUE_MAXSIZE = 256
+
+# Connection confirmation, serialized once
+_CONNECTED_MESSAGE = orjson.dumps({
+    "type": "connected",
+    "stream": "portfolio",
+    "message": "Connected to portfolio stream. Send {\"action\": \"subscribe\", \"account\": \"DU123456\"} to start."
+}).decode()
 
 
 async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: StreamingManager):
@@ -38,26 +51,27 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
                     print(f"Portfolio update: {data['data']}")
     """
     await manager.connect(websocket, "portfolio")
+    monotonic = asyncio.get_running_loop().time
+    
+    # Track active streaming tasks per account
+    active_subscriptions: Dict[str, asyncio.Task] = {}
+    
+    # Updates from all accounts go through one writer, so a slow client never stalls the streams
+    send_queue = DropOldestQueue(_SEND_QUEUE_MAXSIZE)
+    writer = asyncio.create_task(write_messages(websocket, send_queue))
     
     try:
-        await websocket.send_json({
-            "type": "connected",
-            "stream": "portfolio",
-            "message": "Connected to portfolio stream. Send {\"action\": \"subscribe\", \"account\": \"DU123456\"} to start."
-        })
-        
-        # Track active streaming tasks per account
-        active_subscriptions: Dict[str, asyncio.Task] = {}
+        await websocket.send_text(_CONNECTED_MESSAGE)
         
         while True:
-            data = await websocket.receive_json()
+            data = await receive_message(websocket)
             action = data.get("action")
             
             if action == "subscribe":
                 account = data.get("account")
                 
                 if not account:
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "error",
                         "error": "Missing 'account' parameter"
                     })
@@ -65,7 +79,7 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
                 
                 # Check if already subscribed
                 if account in active_subscriptions:
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "warning",
                         "account": account,
                         "message": f"Already subscribed to account {account}"
@@ -74,7 +88,7 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
                 
                 # Check TWS connection
                 if not tws or not tws.is_connected():
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "error",
                         "error": "Not connected to TWS. Call ibkr_connect first."
                     })
@@ -88,16 +102,16 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
                             if not update:
                                 continue
                             
-                            await websocket.send_json({
+                            send_queue.put_latest({
                                 "type": "portfolio",
                                 "account": account,
-                                "timestamp": asyncio.get_event_loop().time(),
+                                "timestamp": monotonic(),
                                 "update": update
                             })
                     except asyncio.CancelledError:
                         pass
                     except Exception as e:
-                        await websocket.send_json({
+                        send_queue.put_latest({
                             "type": "error",
                             "account": account,
                             "error": f"Streaming error: {str(e)}"
@@ -107,7 +121,7 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
                 task = asyncio.create_task(stream_account())
                 active_subscriptions[account] = task
                 
-                await websocket.send_json({
+                await send_message(websocket, {
                     "type": "subscribed",
                     "account": account,
                     "message": f"Subscribed to account {account} updates"
@@ -125,33 +139,30 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
                     
                     del active_subscriptions[account]
                     
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "unsubscribed",
                         "account": account,
                         "message": f"Unsubscribed from account {account}"
                     })
                 else:
-                    await websocket.send_json({
+                    await send_message(websocket, {
                         "type": "warning",
                         "account": account,
                         "message": f"Not subscribed to account {account}"
                     })
             
             elif action == "list":
-                await websocket.send_json({
+                await send_message(websocket, {
                     "type": "subscriptions",
                     "accounts": list(active_subscriptions.keys()),
                     "count": len(active_subscriptions)
                 })
             
             elif action == "ping":
-                await websocket.send_json({
-                    "type": "pong",
-                    "timestamp": asyncio.get_event_loop().time()
-                })
+                await send_pong(websocket, monotonic())
             
             else:
-                await websocket.send_json({
+                await send_message(websocket, {
                     "type": "error",
                     "error": f"Unknown action: {action}",
                     "valid_actions": ["subscribe", "unsubscribe", "list", "ping"]
@@ -161,14 +172,14 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
         pass
     except Exception as e:
         try:
-            await websocket.send_json({
+            await send_message(websocket, {
                 "type": "error",
                 "error": f"Server error: {str(e)}"
             })
         except:
             pass
     finally:
-        # Cleanup all subscriptions
+        # Cleanup all subscriptions and the writer
         for task in active_subscriptions.values():
             task.cancel()
             try:
@@ -176,4 +187,7 @@ async def portfolio_stream(websocket: WebSocket, tws: TWSClient, manager: Stream
             except asyncio.CancelledError:
                 pass
         
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+        
         await manager.disconnect(websocket, "portfolio")
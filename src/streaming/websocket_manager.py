@@ -1,43 +1,209 @@
 """WebSocket connection manager for streaming subscriptions."""
 
-from typing import Dict, List, Any
-from starlette.websockets import WebSocket
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Set, Tuple
+import orjson
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from ..models import ContractRequest
+from ..tws_client import TWSClient
+
+# Tick fields compared to drop snapshots that repeat the previous one (time always changes)
+_QUOTE_FIELDS = ("last", "bid", "ask", "volume", "bidSize", "askSize", "close")
+
+# Broadcast messages waiting for a slow client beyond this are dropped, oldest first
+_BROADCAST_QUEUE_MAXSIZE = 256
+
+
+async def send_message(websocket: WebSocket, message: Any):
+    """Send a message as a JSON text frame, encoded with orjson rather than the stdlib json."""
+    await websocket.send_text(orjson.dumps(message).decode())
+
+
+async def receive_message(websocket: WebSocket) -> Any:
+    """Receive a JSON message from a text or binary frame, decoded with orjson.
+    
+    Raises WebSocketDisconnect when the client disconnects, like receive_json().
+    """
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message["code"], message.get("reason"))
+    payload = message.get("text")
+    if payload is None:
+        payload = message["bytes"]
+    return orjson.loads(payload)
+
+
+async def send_pong(websocket: WebSocket, timestamp: float):
+    """Reply to a client ping; the message is fixed apart from the timestamp, so it is formatted directly."""
+    await websocket.send_text(f'{{"type":"pong","timestamp":{timestamp!r}}}')
+
+
+class DropOldestQueue(asyncio.Queue):
+    """Bounded queue of outgoing messages for a client that may not keep up.
+    
+    put_latest() never blocks the producer: when the queue is full it discards the
+    oldest message and counts it in dropped, which the consumer reports and resets.
+    """
+    
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.dropped = 0
+    
+    def put_latest(self, item: Any):
+        """Queue item, discarding the oldest queued message if the queue is full."""
+        if self.full():
+            self.get_nowait()
+            self.dropped += 1
+        self.put_nowait(item)
+
+
+async def report_dropped(websocket: WebSocket, send_queue: DropOldestQueue):
+    """Tell the client how many queued messages were dropped since the last report, if any."""
+    if send_queue.dropped:
+        dropped, send_queue.dropped = send_queue.dropped, 0
+        await send_message(websocket, {"type": "lag", "dropped": dropped})
+
+
+async def write_messages(websocket: WebSocket, send_queue: DropOldestQueue):
+    """Send queued messages to the client in order until cancelled.
+    
+    Producers queue with put_latest() and never wait on the client; one that falls
+    behind loses the oldest messages and is told how many before the next one.
+    Messages queued as str are taken to be JSON already and sent as they are.
+    """
+    while True:
+        message = await send_queue.get()
+        await report_dropped(websocket, send_queue)
+        if isinstance(message, str):
+            await websocket.send_text(message)
+        else:
+            await send_message(websocket, message)
+
+
+@dataclass(slots=True)
+class _SubState:
+    """Per-connection state kept by StreamingManager."""
+    type: str
+    send_queue: DropOldestQueue  # Broadcast messages waiting for the writer
+    writer: asyncio.Task
+    active: List[Any] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _Upstream:
+    """A TWS market data stream shared by every client subscribed to its contract."""
+    task: asyncio.Task
+    subscribers: Set[asyncio.Queue]  # One queue per subscribed client
+    tws: TWSClient  # Client the stream runs on
 
 
 class StreamingManager:
     """Manages WebSocket connections and TWS subscriptions."""
     
     def __init__(self):
-        self.connections: Dict[str, List[WebSocket]] = {
-            "market_data": [],
-            "portfolio": [],
-            "news": []
+        self.connections: Dict[str, Set[WebSocket]] = {
+            "market_data": set(),
+            "portfolio": set(),
+            "news": set()
         }
-        self.subscriptions: Dict[WebSocket, Dict[str, Any]] = {}
+        self.subscriptions: Dict[WebSocket, _SubState] = {}
+        # One TWS market data stream per contract, fanned out to a queue per subscribed client
+        self.upstream: Dict[Tuple, _Upstream] = {}
+    
+    def subscribe_market_data(self, tws: TWSClient, req: ContractRequest) -> asyncio.Queue:
+        """Return a queue receiving the market data of req's contract.
+        
+        The first subscriber starts the TWS stream on its client; later ones share it,
+        whichever client they pass. A stream whose client has disconnected is restarted
+        on the subscriber's client, keeping its subscribers. The queue gets each changed
+        tick as a dict, then the exception that ended the stream or None.
+        """
+        key = (req.symbol, req.secType, req.exchange, req.currency)
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = self.upstream.get(key)
+        if entry is None:
+            subscribers = {queue}
+        else:
+            entry.subscribers.add(queue)
+            if entry.tws is tws or entry.tws.is_connected():
+                return queue
+            # Replaced before cancelling, so the old task leaves the entry alone
+            subscribers = entry.subscribers
+            entry.task.cancel()
+        task = asyncio.create_task(self._publish_market_data(key, tws, req, subscribers))
+        self.upstream[key] = _Upstream(task, subscribers, tws)
+        return queue
+    
+    def unsubscribe_market_data(self, req: ContractRequest, queue: asyncio.Queue):
+        """Stop delivering to queue, and stop the TWS stream once it has no subscribers."""
+        key = (req.symbol, req.secType, req.exchange, req.currency)
+        entry = self.upstream.get(key)
+        if entry is None:
+            return
+        entry.subscribers.discard(queue)
+        if not entry.subscribers:
+            del self.upstream[key]
+            entry.task.cancel()
+    
+    async def _publish_market_data(self, key: Tuple, tws: TWSClient, req: ContractRequest,
+                                   subscribers: Set[asyncio.Queue]):
+        """Read one TWS market data stream and copy each changed tick to every subscriber."""
+        last_quote = None
+        end = None
+        try:
+            async for market_data in tws.stream_market_data(req):
+                # Skip snapshots whose prices and sizes have not changed
+                quote = tuple(map(market_data.get, _QUOTE_FIELDS))
+                if quote == last_quote:
+                    continue
+                last_quote = quote
+                
+                for queue in subscribers:
+                    queue.put_nowait(market_data)
+        except Exception as e:
+            end = e
+        finally:
+            entry = self.upstream.get(key)
+            if entry is not None and entry.task is asyncio.current_task():
+                del self.upstream[key]
+        # Reached only when the stream ends without being cancelled
+        for queue in subscribers:
+            queue.put_nowait(end)
     
     async def connect(self, websocket: WebSocket, stream_type: str):
-        """Register a new WebSocket connection."""
+        """Register a new WebSocket connection, with a writer for messages broadcast to it."""
         await websocket.accept()
         if stream_type in self.connections:
-            self.connections[stream_type].append(websocket)
-            self.subscriptions[websocket] = {"type": stream_type, "active": []}
+            self.connections[stream_type].add(websocket)
+            send_queue = DropOldestQueue(_BROADCAST_QUEUE_MAXSIZE)
+            self.subscriptions[websocket] = _SubState(
+                stream_type,
+                send_queue,
+                asyncio.create_task(write_messages(websocket, send_queue))
+            )
     
     async def disconnect(self, websocket: WebSocket, stream_type: str):
         """Unregister a WebSocket connection and cleanup subscriptions."""
-        if stream_type in self.connections and websocket in self.connections[stream_type]:
-            self.connections[stream_type].remove(websocket)
+        if stream_type in self.connections:
+            self.connections[stream_type].discard(websocket)
         if websocket in self.subscriptions:
-            del self.subscriptions[websocket]
+            writer = self.subscriptions.pop(websocket).writer
+            writer.cancel()
+            # Also collects the error if the writer already failed on a closed socket
+            await asyncio.gather(writer, return_exceptions=True)
     
     async def broadcast(self, stream_type: str, message: dict):
-        """Broadcast a message to all connected clients of a stream type."""
-        disconnected = []
-        for websocket in self.connections.get(stream_type, []):
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                disconnected.append(websocket)
+        """Broadcast a message to all connected clients of a stream type.
         
-        # Cleanup disconnected clients
-        for ws in disconnected:
-            await self.disconnect(ws, stream_type)
+        Queues the message for each client's writer instead of sending it here, so a
+        slow client neither delays the others nor makes messages pile up without bound.
+        The message is encoded once for all clients rather than by each send.
+        """
+        connections = self.connections.get(stream_type)
+        if not connections:
+            return
+        payload = orjson.dumps(message).decode()
+        for websocket in connections:
+            self.subscriptions[websocket].send_queue.put_latest(payload)
@@ -10,6 +10,11 @@ try:
 except ImportError:
     from src.models import AppContext
 
+# Connection defaults, read from the environment once at import
+_DEFAULT_HOST = os.getenv("TWS_HOST", "127.0.0.1")
+_DEFAULT_PORT = int(os.getenv("TWS_PORT", 7497))
+_DEFAULT_CLIENT_ID = int(os.getenv("TWS_CLIENT_ID", 1))
+
 
 def register_connection_tools(mcp: FastMCP):
     """Register connection management tools."""
@@ -17,9 +22,9 @@ def register_connection_tools(mcp: FastMCP):
     @mcp.tool()
     async def ibkr_connect(
         ctx: Context[ServerSession, AppContext],
-        host: str = os.getenv("TWS_HOST", "127.0.0.1"),
-        port: int = int(os.getenv("TWS_PORT", 7497)),
-        clientId: int = int(os.getenv("TWS_CLIENT_ID", 1))
+        host: str = _DEFAULT_HOST,
+        port: int = _DEFAULT_PORT,
+        clientId: int = _DEFAULT_CLIENT_ID
     ) -> Dict[str, Any]:
         """Connect to TWS/IB Gateway.
         
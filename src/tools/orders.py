@@ -1,12 +1,23 @@
 """Order management tools for IBKR TWS API."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.session import ServerSession
 from ib_async import Stock, Contract, Order, LimitOrder, MarketOrder, StopOrder
 from ..models import AppContext
 
 
+def _page(items: List[Any], offset: int, limit: Optional[int]) -> Tuple[List[Any], int]:
+    """Slice out one page so only the returned items are converted and encoded.
+    
+    Returns the page and the offset actually used, with a negative offset clamped to 0.
+    """
+    offset = max(offset, 0)
+    if limit is None:
+        return items[offset:], offset
+    return items[offset:offset + max(limit, 0)], offset
+
+
 def register_order_tools(mcp: FastMCP):
     """Register order management tools."""
     
@@ -106,12 +117,18 @@ def register_order_tools(mcp: FastMCP):
 
     @mcp.tool()
     async def ibkr_get_open_orders(
-        ctx: Context[ServerSession, AppContext]
+        ctx: Context[ServerSession, AppContext],
+        offset: int = 0,
+        limit: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get all open orders.
         
+        Args:
+            offset: Number of orders to skip (default: 0)
+            limit: Maximum number of orders to return (default: all)
+            
         Returns:
-            List of open orders with details
+            Requested page of open orders with details, and the total count
         """
         tws = ctx.request_context.lifespan_context.tws
         if not tws or not tws.is_connected():
@@ -119,8 +136,9 @@ def register_order_tools(mcp: FastMCP):
         
         trades = tws.ib.openTrades()
         
+        page, offset = _page(trades, offset, limit)
         orders = []
-        for trade in trades:
+        for trade in page:
             orders.append({
                 "orderId": trade.order.orderId,
                 "contract": {
@@ -141,16 +159,27 @@ def register_order_tools(mcp: FastMCP):
                 "remaining": trade.orderStatus.remaining if trade.orderStatus else trade.order.totalQuantity
             })
         
-        return {"orders": orders, "count": len(orders)}
+        return {
+            "orders": orders,
+            "count": len(orders),
+            "total": len(trades),
+            "offset": offset
+        }
 
     @mcp.tool()
     async def ibkr_get_all_orders(
-        ctx: Context[ServerSession, AppContext]
+        ctx: Context[ServerSession, AppContext],
+        offset: int = 0,
+        limit: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get all orders (including filled and cancelled).
         
+        Args:
+            offset: Number of orders to skip (default: 0)
+            limit: Maximum number of orders to return (default: all)
+            
         Returns:
-            List of all orders with details
+            Requested page of orders with details, and the total count
         """
         tws = ctx.request_context.lifespan_context.tws
         if not tws or not tws.is_connected():
@@ -158,8 +187,9 @@ def register_order_tools(mcp: FastMCP):
         
         trades = tws.ib.trades()
         
+        page, offset = _page(trades, offset, limit)
         orders = []
-        for trade in trades:
+        for trade in page:
             orders.append({
                 "orderId": trade.order.orderId,
                 "contract": {
@@ -181,7 +211,12 @@ def register_order_tools(mcp: FastMCP):
                 "avgFillPrice": trade.orderStatus.avgFillPrice if trade.orderStatus else 0
             })
         
-        return {"orders": orders, "count": len(orders)}
+        return {
+            "orders": orders,
+            "count": len(orders),
+            "total": len(trades),
+            "offset": offset
+        }
     
     @mcp.tool()
     async def ibkr_modify_order(
@@ -240,7 +275,9 @@ def register_order_tools(mcp: FastMCP):
         ctx: Context[ServerSession, AppContext],
         symbol: Optional[str] = None,
         secType: Optional[str] = None,
-        exchange: Optional[str] = None
+        exchange: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get execution history.
         
@@ -248,9 +285,11 @@ def register_order_tools(mcp: FastMCP):
             symbol: Filter by symbol (optional)
             secType: Filter by security type (optional)
             exchange: Filter by exchange (optional)
+            offset: Number of executions to skip (default: 0)
+            limit: Maximum number of executions to return (default: all)
             
         Returns:
-            List of executions with fill details
+            Requested page of executions with fill details, and the total count
         """
         tws = ctx.request_context.lifespan_context.tws
         if not tws or not tws.is_connected():
@@ -267,8 +306,9 @@ def register_order_tools(mcp: FastMCP):
         
         executions = await tws.ib.reqExecutionsAsync(filter)
         
+        page, offset = _page(executions, offset, limit)
         results = []
-        for fill in executions:
+        for fill in page:
             results.append({
                 "execId": fill.execution.execId,
                 "orderId": fill.execution.orderId,
@@ -292,7 +332,12 @@ def register_order_tools(mcp: FastMCP):
                 } if fill.commissionReport else None
             })
         
-        return {"executions": results, "count": len(results)}
+        return {
+            "executions": results,
+            "count": len(results),
+            "total": len(executions),
+            "offset": offset
+        }
     
     @mcp.tool()
     async def ibkr_place_bracket_order(
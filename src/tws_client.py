@@ -1,8 +1,11 @@
 from ib_async import IB, Stock, Option, Future, Contract, MarketOrder, LimitOrder, util
 from typing import List, Dict, Any, Optional, AsyncGenerator
 import asyncio
+import logging
 from src.models import ContractRequest, OrderRequest
 
+logger = logging.getLogger(__name__)
+
 
 def _to_dict(obj):
     """Safely convert dataclass-like objects to dicts for tests and runtime.
@@ -551,9 +554,10 @@ class TWSClient:
 
         try:
             # Wait for initial snapshot - give TWS time to send initial data
-            print(f"[STREAM DEBUG] Requested market data for {contract.symbol}, waiting for initial snapshot...")
+            logger.debug("[STREAM DEBUG] Requested market data for %s, waiting for initial snapshot...", contract.symbol)
             await asyncio.sleep(1.0)  # Wait for initial data
-            print(f"[STREAM DEBUG] Got initial snapshot for {contract.symbol}: time={ticker.time}, last={ticker.last}, bid={ticker.bid}, ask={ticker.ask}")
+            logger.debug("[STREAM DEBUG] Got initial snapshot for %s: time=%s, last=%s, bid=%s, ask=%s",
+                         contract.symbol, ticker.time, ticker.last, ticker.bid, ticker.ask)
             
             # Check for immediate errors (like missing market data subscription)
             await asyncio.sleep(0.5)  # Give TWS time to send error if any
@@ -568,7 +572,7 @@ class TWSClient:
             # Yield initial snapshot if available
             has_price = ticker.last or ticker.bid or ticker.ask
             if ticker.time and has_price:
-                print(f"[STREAM DEBUG] Yielding initial snapshot for {contract.symbol}")
+                logger.debug("[STREAM DEBUG] Yielding initial snapshot for %s", contract.symbol)
                 yield {
                     "time": ticker.time.isoformat(),
                     "last": ticker.last,
@@ -603,7 +607,9 @@ class TWSClient:
                 if ticker.time and has_price:
                     # Only yield if this is new data (different timestamp)
                     if last_time_yielded is None or ticker.time != last_time_yielded:
-                        print(f"[STREAM DEBUG] {contract.symbol} - New data: time={ticker.time}, last={ticker.last}, bid={ticker.bid}, ask={ticker.ask}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("[STREAM DEBUG] %s - New data: time=%s, last=%s, bid=%s, ask=%s",
+                                         contract.symbol, ticker.time, ticker.last, ticker.bid, ticker.ask)
                         last_time_yielded = ticker.time
                         yield {
                             "time": ticker.time.isoformat(),
@@ -617,11 +623,10 @@ class TWSClient:
                         }
                     else:
                         # Same timestamp, no new data yet
-                        print(f"[STREAM DEBUG] {contract.symbol} - Same timestamp, waiting for new data...")
+                        logger.debug("[STREAM DEBUG] %s - Same timestamp, waiting for new data...", contract.symbol)
                 else:
-                    # No meaningful update yet
-                    print(f"[STREAM DEBUG] {contract.symbol} - No price data yet")
-                    yield {}
+                    # No meaningful update yet; nothing is yielded until there is one
+                    logger.debug("[STREAM DEBUG] %s - No price data yet", contract.symbol)
         
         except asyncio.CancelledError:
             # Clean up when the generator is closed
@@ -658,31 +663,31 @@ class TWSClient:
         This uses IB's updatePortfolio and updateAccountValue events to get
         real-time notifications when positions or account values change.
         """
-        print(f"[TWS CLIENT] stream_account_updates called for {account}")
+        logger.debug("[TWS CLIENT] stream_account_updates called for %s", account)
         
         if not self.is_connected():
             raise RuntimeError("Not connected to TWS")
 
         # Use the lower-level client API directly to avoid event loop issues
         # This sends the request without waiting for a response
-        print(f"[TWS CLIENT] Requesting account updates for {account}...")
+        logger.debug("[TWS CLIENT] Requesting account updates for %s...", account)
         # Client.reqAccountUpdates(subscribe: bool, acctCode: str)
         self.ib.client.reqAccountUpdates(True, account)
-        print(f"[TWS CLIENT] Account updates request sent for {account}")
+        logger.debug("[TWS CLIENT] Account updates request sent for %s", account)
         
         # Give TWS a moment to start sending data
         await asyncio.sleep(0.5)
         
         # Queue to collect events
         event_queue: asyncio.Queue = asyncio.Queue()
-        print(f"[TWS CLIENT] Event queue created")
+        logger.debug("[TWS CLIENT] Event queue created")
         
         # Event handler for portfolio updates
         def on_update_portfolio(item):
             """Called when a position is updated."""
-            print(f"[TWS CLIENT] on_update_portfolio fired: {item.account} == {account}? {item.account == account}")
             if item.account == account:
-                print(f"[TWS CLIENT] Adding portfolio update to queue: {item.contract.symbol}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[TWS CLIENT] Adding portfolio update to queue: %s", item.contract.symbol)
                 event_queue.put_nowait({
                     "type": "portfolio_item",
                     "data": {
@@ -700,9 +705,9 @@ class TWSClient:
         # Event handler for account value updates
         def on_update_account_value(item):
             """Called when an account value is updated."""
-            print(f"[TWS CLIENT] on_update_account_value fired: {item.account} == {account}? {item.account == account}")
             if item.account == account:
-                print(f"[TWS CLIENT] Adding account value to queue: {item.tag}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[TWS CLIENT] Adding account value to queue: %s", item.tag)
                 event_queue.put_nowait({
                     "type": "account_value",
                     "data": {
@@ -715,10 +720,10 @@ class TWSClient:
                 })
         
         # Subscribe to events
-        print(f"[TWS CLIENT] Subscribing to portfolio events for account {account}")
+        logger.debug("[TWS CLIENT] Subscribing to portfolio events for account %s", account)
         self.ib.updatePortfolioEvent += on_update_portfolio
         self.ib.accountValueEvent += on_update_account_value
-        print(f"[TWS CLIENT] Event handlers attached")
+        logger.debug("[TWS CLIENT] Event handlers attached")
 
         try:
             # Give a moment for initial events to fire and populate queue
@@ -727,11 +732,11 @@ class TWSClient:
             # Yield any initial queued events
             while not event_queue.empty():
                 event = event_queue.get_nowait()
-                print(f"[TWS CLIENT] Yielding initial event from queue: {event['type']}")
+                logger.debug("[TWS CLIENT] Yielding initial event from queue: %s", event['type'])
                 yield event
             
             # Enter main streaming loop
-            print(f"[TWS CLIENT] Entering main streaming loop for {account}")
+            logger.debug("[TWS CLIENT] Entering main streaming loop for %s", account)
             while True:
                 # Wait for IB to process updates (same as market data streaming)
                 # This is the key: it allows the event loop to run and fire our event handlers
@@ -740,7 +745,7 @@ class TWSClient:
                 # Check if we have any queued events
                 if not event_queue.empty():
                     event = event_queue.get_nowait()
-                    print(f"[TWS CLIENT] Yielding event from queue: {event['type']}")
+                    logger.debug("[TWS CLIENT] Yielding event from queue: %s", event['type'])
                     yield event
                 else:
                     # No new data, yield empty dict to keep generator alive
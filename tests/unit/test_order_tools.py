@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from ib_async import CommissionReport, Contract, Execution, Fill, Order, OrderStatus, Trade
+from mcp.server.fastmcp import FastMCP
+from src.tools.orders import register_order_tools, _page
+
+
+@pytest.fixture
+def order_tools():
+    mcp = FastMCP("test")
+    register_order_tools(mcp)
+    return {tool.name: tool.fn for tool in mcp._tool_manager.list_tools()}
+
+
+@pytest.fixture
+def mock_ctx():
+    tws = MagicMock()
+    tws.is_connected = MagicMock(return_value=True)
+    tws.ib.openTrades = MagicMock(return_value=[
+        Trade(
+            contract=Contract(symbol=f"SYM{i}", secType="STK", exchange="SMART", currency="USD"),
+            order=Order(orderId=i, action="BUY", totalQuantity=10, orderType="LMT", lmtPrice=100.0),
+            orderStatus=OrderStatus(orderId=i, status="Submitted", remaining=10)
+        )
+        for i in range(5)
+    ])
+    tws.ib.trades = tws.ib.openTrades
+    tws.ib.reqExecutionsAsync = AsyncMock(return_value=[
+        Fill(
+            contract=Contract(symbol="AAPL", secType="STK", exchange="SMART", currency="USD"),
+            execution=Execution(execId=f"000{i}", orderId=i, shares=10, price=100.5, side="BOT"),
+            commissionReport=CommissionReport(commission=1.0),
+            time=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        for i in range(3)
+    ])
+    ctx = MagicMock()
+    ctx.request_context.lifespan_context.tws = tws
+    return ctx
+
+
+def test_page():
+    items = list(range(10))
+    assert _page(items, 0, None) == (items, 0)
+    assert _page(items, 8, None) == ([8, 9], 8)
+    assert _page(items, 2, 3) == ([2, 3, 4], 2)
+    assert _page(items, 9, 5) == ([9], 9)
+    assert _page(items, 20, 5) == ([], 20)
+    assert _page(items, -1, 2) == ([0, 1], 0)
+    assert _page(items, 0, -1) == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_ibkr_get_open_orders_paged(order_tools, mock_ctx):
+    result = await order_tools["ibkr_get_open_orders"](mock_ctx)
+    assert result["count"] == 5
+    assert result["total"] == 5
+    assert result["offset"] == 0
+
+    result = await order_tools["ibkr_get_open_orders"](mock_ctx, offset=1, limit=2)
+    assert [order["orderId"] for order in result["orders"]] == [1, 2]
+    assert result["count"] == 2
+    assert result["total"] == 5
+    assert result["offset"] == 1
+
+    result = await order_tools["ibkr_get_open_orders"](mock_ctx, offset=-3, limit=1)
+    assert [order["orderId"] for order in result["orders"]] == [0]
+    assert result["offset"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ibkr_get_executions_paged(order_tools, mock_ctx):
+    result = await order_tools["ibkr_get_executions"](mock_ctx, offset=2, limit=10)
+    assert [execution["execId"] for execution in result["executions"]] == ["0002"]
+    assert result["count"] == 1
+    assert result["total"] == 3
+    assert result["offset"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ibkr_get_all_orders_paged(order_tools, mock_ctx):
+    result = await order_tools["ibkr_get_all_orders"](mock_ctx, offset=3)
+    assert [order["orderId"] for order in result["orders"]] == [3, 4]
+    assert result["count"] == 2
+    assert result["total"] == 5
+    assert result["offset"] == 3
@@ -0,0 +1,256 @@
+import pytest
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+from ib_async import IB, Contract, Ticker
+from mcp.server.fastmcp import FastMCP
+from src.models import AppContext, PortfolioEntry
+from src.resources import market_data as market_data_module
+from src.resources import news as news_module
+from src.resources.market_data import register_market_data_resource, cancel_market_data_streams
+from src.resources.news import register_news_resource, remove_tick_news_router
+from src.resources.streams import register_streams_resource
+
+
+def _tools(register):
+    """Register a resource module on a fresh server and return its tool functions by name."""
+    mcp = FastMCP("test")
+    register(mcp)
+    return {tool.name: tool.fn for tool in mcp._tool_manager.list_tools()}
+
+
+def _session():
+    session = MagicMock()
+    session.send_resource_updated = AsyncMock()
+    return session
+
+
+def _context(tws, session, app_ctx=None):
+    ctx = MagicMock()
+    ctx.session = session
+    ctx.request_context.lifespan_context = app_ctx or MagicMock(tws=tws)
+    return ctx
+
+
+@pytest.fixture
+def market_tws():
+    """TWS client whose market data stream yields the ticks put on tws.ticks, or raises an exception put there."""
+    tws = MagicMock()
+    tws.is_connected = MagicMock(return_value=True)
+    tws.ticks = asyncio.Queue()
+
+    async def stream_market_data(req):
+        while True:
+            tick = await tws.ticks.get()
+            if isinstance(tick, Exception):
+                raise tick
+            yield tick
+
+    tws.stream_market_data = MagicMock(side_effect=stream_market_data)
+    yield tws
+    for entry in list(market_data_module._market_streams.values()):
+        entry.task.cancel()
+    market_data_module._market_streams.clear()
+
+
+@pytest.mark.asyncio
+async def test_market_data_resource_shared_between_sessions(market_tws):
+    """Two sessions share one TWS stream; one stopping leaves it running for the other."""
+    tools = _tools(register_market_data_resource)
+    session_a, session_b = _session(), _session()
+
+    result_a = json.loads(await tools["ibkr_start_market_data_resource"](_context(market_tws, session_a), "AAPL"))
+    result_b = json.loads(await tools["ibkr_start_market_data_resource"](_context(market_tws, session_b), "AAPL"))
+    assert result_a["status"] == "subscribed"
+    assert result_b["status"] == "already_subscribed"
+
+    market_tws.ticks.put_nowait({"last": 100.0})
+    await asyncio.sleep(0.01)
+    assert market_tws.stream_market_data.call_count == 1
+    session_a.send_resource_updated.assert_awaited_with("ibkr://market-data/AAPL")
+    session_b.send_resource_updated.assert_awaited_with("ibkr://market-data/AAPL")
+
+    result = json.loads(await tools["ibkr_stop_market_data_resource"](_context(market_tws, session_a), "AAPL"))
+    assert result["status"] == "unsubscribed"
+    assert result["subscribers"] == 1
+    assert not market_data_module._market_streams["AAPL"].task.done()
+
+    result = json.loads(await tools["ibkr_stop_market_data_resource"](_context(market_tws, session_b), "AAPL"))
+    assert result["status"] == "stopped"
+    assert "AAPL" not in market_data_module._market_streams
+
+
+@pytest.mark.asyncio
+async def test_market_data_resource_restarts_after_stream_dies(market_tws):
+    """A stream ended by a TWS error is removed, so the next start creates a new one."""
+    tools = _tools(register_market_data_resource)
+    ctx = _context(market_tws, _session())
+
+    await tools["ibkr_start_market_data_resource"](ctx, "AAPL")
+    market_tws.ticks.put_nowait(RuntimeError("TWS Error 200"))
+    await asyncio.sleep(0.01)
+    assert "AAPL" not in market_data_module._market_streams
+
+    result = json.loads(await tools["ibkr_start_market_data_resource"](ctx, "AAPL"))
+    await asyncio.sleep(0.01)
+    assert result["status"] == "subscribed"
+    assert market_tws.stream_market_data.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_market_data_resource_ends_with_owning_session(market_tws):
+    """Streams running on a session's TWS client are cancelled when that session ends."""
+    tools = _tools(register_market_data_resource)
+    await tools["ibkr_start_market_data_resource"](_context(market_tws, _session()), "AAPL")
+    task = market_data_module._market_streams["AAPL"].task
+
+    cancel_market_data_streams(market_tws)
+    await asyncio.sleep(0.01)
+    assert task.done()
+    assert "AAPL" not in market_data_module._market_streams
+
+
+@pytest.mark.asyncio
+async def test_list_active_resource_streams(market_tws, monkeypatch):
+    """Streams are listed as a count and list per resource type, including empty types."""
+    tools = _tools(register_market_data_resource)
+    list_streams = _tools(register_streams_resource)["ibkr_list_active_resource_streams"]
+    app_ctx = AppContext(tws=market_tws)
+    app_ctx.portfolio_streams["U123456"] = PortfolioEntry({}, 123456.789)
+    monkeypatch.setattr(news_module, "_news_resource_subscription", True)
+    ctx = _context(market_tws, _session(), app_ctx)
+
+    await tools["ibkr_start_market_data_resource"](ctx, "AAPL")
+    result = json.loads(await list_streams(ctx))
+
+    assert set(result) == {"market_data", "portfolio", "news", "tick_news", "broadtape_news"}
+    assert result["market_data"]["count"] == 1
+    assert result["market_data"]["streams"][0]["resource_id"] == "AAPL"
+    assert result["market_data"]["streams"][0]["status"] == "running"
+    assert result["portfolio"]["count"] == 1
+    assert result["portfolio"]["streams"][0]["account"] == "U123456"
+    assert result["portfolio"]["streams"][0]["status"] == "not_started"
+    assert result["news"]["count"] == 1
+    assert result["news"]["streams"][0]["resource_uri"] == "ibkr://news-bulletins"
+    assert result["tick_news"] == {"count": 0, "streams": []}
+    assert result["broadtape_news"] == {"count": 0, "streams": []}
+
+
+@pytest.fixture
+def news_tws():
+    """TWS client on an unconnected IB whose market data requests return tickers registered by request id."""
+    tws = MagicMock()
+    tws.is_connected = MagicMock(return_value=True)
+    tws.ib = IB()
+    tws.ib.qualifyContractsAsync = AsyncMock(side_effect=lambda contract: [contract])
+    tws.req_ids = {}
+
+    def req_mkt_data(contract, genericTickList=""):
+        ticker = Ticker(contract=contract)
+        req_id = len(tws.req_ids) + 1
+        tws.ib.wrapper.reqId2Ticker[req_id] = ticker
+        tws.req_ids[contract.symbol] = req_id
+        return ticker
+
+    tws.ib.reqMktData = MagicMock(side_effect=req_mkt_data)
+    return tws
+
+
+@pytest.mark.asyncio
+async def test_tick_news_routed_by_ticker(news_tws, monkeypatch):
+    """News ticks fed to the wrapper reach their symbol's cache once, and expire after the TTL."""
+    tools = _tools(register_news_resource)
+    app_ctx = AppContext(tws=news_tws)
+    session = _session()
+    ctx = _context(news_tws, session, app_ctx)
+    wrapper = news_tws.ib.wrapper
+    event_ticks = []
+    news_tws.ib.tickNewsEvent += event_ticks.append
+    now = 1_700_000_000
+
+    monkeypatch.setattr(news_module, "time_ns", lambda: now * 1_000_000_000)
+    await tools["ibkr_start_tick_news_resource"](ctx, "AAPL")
+    await tools["ibkr_start_tick_news_resource"](ctx, "MSFT")
+    await asyncio.sleep(0.01)
+
+    aapl, msft = news_tws.req_ids["AAPL"], news_tws.req_ids["MSFT"]
+    wrapper.tickNews(aapl, 0, "BZ", "a1", "Apple headline", "")
+    wrapper.tickNews(aapl, 0, "BZ", "a1", "Apple headline", "")  # Re-sent by IB
+    wrapper.tickNews(msft, 0, "BZ", "m1", "Microsoft headline", "")
+    wrapper.tickNews(99, 0, "BZ", "x1", "Unknown request", "")
+    await asyncio.sleep(0.1)
+
+    tick_news = app_ctx.tick_news
+    assert [item.articleId for item in tick_news.cache["AAPL"]] == ["a1"]
+    assert [item.articleId for item in tick_news.cache["MSFT"]] == ["m1"]
+    assert len(event_ticks) == 4  # tickNewsEvent subscribers still see every tick
+    session.send_resource_updated.assert_any_await("ibkr://tick-news/AAPL")
+    session.send_resource_updated.assert_any_await("ibkr://tick-news/MSFT")
+
+    # Headlines older than the TTL are dropped when the next batch arrives
+    now += news_module._NEWS_TTL + 1
+    wrapper.tickNews(aapl, 0, "BZ", "a2", "Later Apple headline", "")
+    await asyncio.sleep(0.1)
+    assert [item.articleId for item in tick_news.cache["AAPL"]] == ["a2"]
+    assert not tick_news.cache["MSFT"]
+
+    # Stopping the last stream restores the wrapper's own callback
+    await tools["ibkr_stop_tick_news_resource"](ctx, "*")
+    assert "tickNews" not in vars(wrapper)
+
+
+@pytest.mark.asyncio
+async def test_tick_news_router_removed_with_session(news_tws):
+    """Removing the router drops every route and restores the wrapper's callback."""
+    ticker = Ticker(contract=Contract(symbol="AAPL"))
+    news_tws.ib.wrapper.reqId2Ticker[1] = ticker
+    handler = MagicMock()
+    news_module._attach_tick_news_route(news_tws.ib, ticker, handler)
+    news_tws.ib.wrapper.tickNews(1, 0, "BZ", "a1", "Headline", "")
+    assert handler.call_count == 1
+
+    remove_tick_news_router(news_tws.ib)
+    assert "tickNews" not in vars(news_tws.ib.wrapper)
+    news_tws.ib.wrapper.tickNews(1, 0, "BZ", "a2", "Headline", "")
+    assert handler.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_tick_news_duplicates_do_not_notify(news_tws):
+    """A batch of only re-sent headlines neither notifies nor invalidates the serialized resource."""
+    tools = _tools(register_news_resource)
+    app_ctx = AppContext(tws=news_tws)
+    session = _session()
+    ctx = _context(news_tws, session, app_ctx)
+    tick_news = app_ctx.tick_news
+
+    await tools["ibkr_start_tick_news_resource"](ctx, "AAPL")
+    await asyncio.sleep(0.01)
+    aapl = news_tws.req_ids["AAPL"]
+    news_tws.ib.wrapper.tickNews(aapl, 0, "BZ", "a1", "Apple headline", "")
+    await asyncio.sleep(0.1)
+    assert session.send_resource_updated.await_count == 1
+
+    tick_news.json["AAPL"] = "cached"
+    news_tws.ib.wrapper.tickNews(aapl, 0, "BZ", "a1", "Apple headline", "")
+    await asyncio.sleep(0.1)
+    assert session.send_resource_updated.await_count == 1
+    assert tick_news.json == {"AAPL": "cached"}
+
+    await tools["ibkr_stop_tick_news_resource"](ctx, "*")
+
+
+@pytest.mark.asyncio
+async def test_tick_news_dispatcher_stops_with_last_stream(news_tws):
+    """The dispatcher stops once the last symbol's stream ends on its own."""
+    tools = _tools(register_news_resource)
+    app_ctx = AppContext(tws=news_tws)
+    news_tws.ib.qualifyContractsAsync = AsyncMock(return_value=[])  # Streams end at once
+
+    await tools["ibkr_start_tick_news_resource"](_context(news_tws, _session(), app_ctx), "AAPL")
+    dispatcher = app_ctx.tick_news.dispatch_task
+    await asyncio.sleep(0.01)
+
+    assert not app_ctx.tick_news.subscriptions
+    assert app_ctx.tick_news.dispatch_task is None
+    assert dispatcher.cancelled()
@@ -0,0 +1,221 @@
+import pytest
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+from src.models import ContractRequest
+from src.streaming import StreamingManager
+from src.streaming import market_data as market_data_module
+from src.streaming.market_data import _Connection, _subscribe_many, market_data_stream
+from src.streaming.websocket_manager import DropOldestQueue, report_dropped, write_messages
+
+
+def _market_tws():
+    """TWS client whose market data stream yields the ticks put on tws.ticks.
+
+    An exception put there is raised, and None ends the stream.
+    """
+    tws = MagicMock()
+    tws.is_connected = MagicMock(return_value=True)
+    tws.ticks = asyncio.Queue()
+
+    async def stream_market_data(req):
+        while True:
+            tick = await tws.ticks.get()
+            if tick is None:
+                return
+            if isinstance(tick, Exception):
+                raise tick
+            yield tick
+
+    tws.stream_market_data = MagicMock(side_effect=stream_market_data)
+    return tws
+
+
+def _websocket():
+    """WebSocket mock recording the JSON frames sent to it."""
+    websocket = MagicMock()
+    websocket.sent = []
+    websocket.send_text = AsyncMock(side_effect=lambda text: websocket.sent.append(json.loads(text)))
+    return websocket
+
+
+def _client_websocket():
+    """WebSocket mock for an endpoint, receiving the client frames put on websocket.incoming."""
+    websocket = _websocket()
+    websocket.accept = AsyncMock()
+    websocket.incoming = asyncio.Queue()
+    websocket.receive = AsyncMock(side_effect=websocket.incoming.get)
+    return websocket
+
+
+def test_drop_oldest_queue():
+    """A full queue drops its oldest messages to make room and counts them."""
+    queue = DropOldestQueue(3)
+    for i in range(5):
+        queue.put_latest(i)
+
+    assert queue.dropped == 2
+    assert [queue.get_nowait() for _ in range(3)] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_report_dropped():
+    """A lag frame is sent only when messages were dropped, and the count is reset."""
+    websocket = _websocket()
+    queue = DropOldestQueue(1)
+
+    await report_dropped(websocket, queue)
+    assert websocket.sent == []
+
+    queue.put_latest("a")
+    queue.put_latest("b")
+    await report_dropped(websocket, queue)
+    assert websocket.sent == [{"type": "lag", "dropped": 1}]
+    assert queue.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_write_messages_reports_lag_before_next_message():
+    """The writer sends queued messages in order, preceded by a lag frame after drops."""
+    websocket = _websocket()
+    queue = DropOldestQueue(2)
+    for i in range(4):
+        queue.put_latest({"i": i})
+    pre_encoded = '{"i":4}'  # Pre-encoded messages are sent unchanged
+
+    writer = asyncio.create_task(write_messages(websocket, queue))
+    await asyncio.sleep(0.01)
+    queue.put_latest(pre_encoded)
+    await asyncio.sleep(0.01)
+    writer.cancel()
+
+    assert websocket.sent == [{"type": "lag", "dropped": 2}, {"i": 2}, {"i": 3}, {"i": 4}]
+
+
+@pytest.mark.asyncio
+async def test_market_data_shared_between_subscribers():
+    """Subscribers of one contract share a TWS stream, which stops with the last of them."""
+    manager = StreamingManager()
+    tws = _market_tws()
+    req = ContractRequest(symbol="AAPL")
+
+    queue_a = manager.subscribe_market_data(tws, req)
+    queue_b = manager.subscribe_market_data(tws, req)
+    tws.ticks.put_nowait({"last": 100.0})
+    tws.ticks.put_nowait({"last": 100.0})  # Unchanged quote, not published
+    tws.ticks.put_nowait({"last": 101.0})
+    await asyncio.sleep(0.01)
+
+    assert tws.stream_market_data.call_count == 1
+    for queue in (queue_a, queue_b):
+        assert queue.get_nowait() == {"last": 100.0}
+        assert queue.get_nowait() == {"last": 101.0}
+        assert queue.empty()
+
+    task = next(iter(manager.upstream.values())).task
+    manager.unsubscribe_market_data(req, queue_a)
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    manager.unsubscribe_market_data(req, queue_b)
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    assert not manager.upstream
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("end", [None, RuntimeError("TWS Error 200")])
+async def test_market_data_end_delivered_to_subscribers(end):
+    """When the TWS stream ends, every subscriber gets the exception that ended it, or None."""
+    manager = StreamingManager()
+    tws = _market_tws()
+    req = ContractRequest(symbol="AAPL")
+
+    queues = [manager.subscribe_market_data(tws, req) for _ in range(2)]
+    tws.ticks.put_nowait(end)
+    await asyncio.sleep(0.01)
+
+    for queue in queues:
+        assert queue.get_nowait() is end
+    assert not manager.upstream
+
+
+@pytest.mark.asyncio
+async def test_market_data_restarted_on_new_client():
+    """A stream whose client disconnected moves to the next subscriber's client, keeping its subscribers."""
+    manager = StreamingManager()
+    old_tws, new_tws = _market_tws(), _market_tws()
+    req = ContractRequest(symbol="AAPL")
+
+    queue_a = manager.subscribe_market_data(old_tws, req)
+    await asyncio.sleep(0)
+    old_task = next(iter(manager.upstream.values())).task
+
+    # Another client shares the running stream
+    queue_b = manager.subscribe_market_data(new_tws, req)
+    assert next(iter(manager.upstream.values())).task is old_task
+
+    old_tws.is_connected.return_value = False
+    queue_c = manager.subscribe_market_data(new_tws, req)
+    new_tws.ticks.put_nowait({"last": 100.0})
+    await asyncio.sleep(0.01)
+
+    assert old_task.cancelled()
+    assert len(manager.upstream) == 1
+    assert next(iter(manager.upstream.values())).tws is new_tws
+    for queue in (queue_a, queue_b, queue_c):
+        assert queue.get_nowait() == {"last": 100.0}
+
+
+@pytest.mark.asyncio
+async def test_market_data_keepalive(monkeypatch):
+    """A client silent through the keepalive intervals is dropped; one answering pings is kept."""
+    monkeypatch.setattr(market_data_module, "_KEEPALIVE_TIMEOUT", 0.05)
+    silent, replying = _client_websocket(), _client_websocket()
+
+    def reply(text):
+        replying.sent.append(json.loads(text))
+        if replying.sent[-1]["type"] == "ping":
+            replying.incoming.put_nowait({"type": "websocket.receive", "text": '{"action": "ping"}'})
+
+    replying.send_text.side_effect = reply
+    silent_endpoint = asyncio.create_task(market_data_stream(silent, _market_tws(), StreamingManager()))
+    replying_endpoint = asyncio.create_task(market_data_stream(replying, _market_tws(), StreamingManager()))
+    await asyncio.sleep(0.3)
+
+    assert silent_endpoint.done()
+    assert [message["type"] for message in silent.sent] == ["connected", "ping"]
+    assert not replying_endpoint.done()
+    assert [message["type"] for message in replying.sent[:3]] == ["connected", "ping", "pong"]
+
+    replying.incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.wait_for(replying_endpoint, 1)
+
+
+@pytest.mark.asyncio
+async def test_subscribe_many_reports_invalid_contracts():
+    """Malformed entries in a batch are reported by index while the valid ones subscribe."""
+    websocket = _websocket()
+    conn = _Connection(websocket, _market_tws(), StreamingManager(), DropOldestQueue(10), asyncio.get_running_loop().time)
+    contracts = [
+        {"symbol": "AAPL"},
+        "MSFT",
+        {"secType": "STK"},
+        {"symbol": "IBM", "exchange": {"primary": "NYSE"}},  # Unhashable
+        {"symbol": "TSLA", "currency": 1},
+        {"symbol": "AAPL"},
+    ]
+
+    await _subscribe_many(conn, {"action": "subscribe_many", "contracts": contracts})
+    ack = websocket.sent[-1]
+    assert ack["type"] == "subscribed_batch"
+    assert ack["symbols"] == ["AAPL"]
+    assert ack["skipped"] == ["AAPL"]
+    assert [entry["index"] for entry in ack["invalid"]] == [1, 2, 3, 4]
+    assert list(conn.active_subscriptions) == ["AAPL"]
+
+    await _subscribe_many(conn, {"action": "subscribe_many", "contracts": {"symbol": "MSFT"}})
+    assert websocket.sent[-1]["type"] == "error"
+
+    for task in conn.active_subscriptions.values():
+        task.cancel()